@@ -0,0 +1,64 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.timing import measure_time
+from weather.analytics import WeatherAnalytics
+
+
+# Erzeugt tägliche Daten für stations Standorte über years Jahre (Jahresgang plus Rauschen, ~1 % fehlende Werte)
+def build_location_data(stations: int, years: int, seed: int = 0) -> dict[str, pd.DataFrame]:
+    rng   = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=365 * years, freq="D")
+    cycle = -np.cos(2 * np.pi * dates.dayofyear.to_numpy() / 365.25)
+
+    location_data = {}
+    for station in range(stations):
+        mean = rng.uniform(-5, 25)
+        temp = mean + 10 * cycle + rng.normal(0, 3, len(dates))
+        temp[rng.random(len(dates)) < 0.01] = np.nan
+        location_data[f"Station {station}"] = pd.DataFrame({
+            "date": dates,
+            "temp_avg": temp,
+            "temp_max": temp + rng.uniform(3, 8, len(dates)),
+            "rain": rng.exponential(2, len(dates))
+        })
+    return location_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skalierung der Klimastatistiken mit Anzahl Standorte und Jahren.")
+    parser.add_argument("--stations", type=int, nargs="+", default=[10, 100, 1000], help="Anzahl Standorte")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 10, 30], help="Anzahl Jahre")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen pro Messung (bester Wert zählt)")
+    args = parser.parse_args()
+
+    analytics = WeatherAnalytics()
+    metrics   = {
+        "anomalies": lambda df: analytics.anomalies(df),
+        "rolling_30": lambda df: analytics.rolling_mean(df, window=30),
+        "percentiles": lambda df: analytics.percentiles(df),
+        "degree_days": lambda df: analytics.degree_days(df),
+        "extremes": lambda df: analytics.extreme_events(df, threshold=30, min_duration=3),
+        "grouped": lambda df: analytics.grouped(df, ["temp_avg", "rain"])
+    }
+
+    print(f"{'Standorte':>10} {'Jahre':>6} {'Zeilen':>12} {'prepare':>9}" + "".join(f" {name:>12}" for name in metrics) + f" {'Zeilen/s':>12}")
+    for stations in args.stations:
+        for years in args.years:
+            location_data = build_location_data(stations, years)
+            prepare_time  = measure_time(lambda: analytics.prepare(location_data), args.repeat)
+            long          = analytics.prepare(location_data)
+            times         = {name: measure_time(lambda: metric(long), args.repeat) for name, metric in metrics.items()}
+
+            total = prepare_time + sum(times.values())
+            print(
+                f"{stations:>10} {years:>6} {len(long):>12} {prepare_time * 1e3:>7.1f}ms"
+                + "".join(f" {value * 1e3:>10.1f}ms" for value in times.values())
+                + f" {len(long) * (len(metrics) + 1) / total:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
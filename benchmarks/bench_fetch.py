@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.fake_server import FakeOpenWeatherServer
+from benchmarks.generators import build_locations
+
+os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+
+from weather import WeatherDataFetcher
+
+
+# Sequenzieller Abruf wie in weather-api.ipynb (Referenzwert)
+def fetch_sequential(fetcher: WeatherDataFetcher, locations: list[dict]) -> list:
+    results = []
+    for location in locations:
+        coordinates = fetcher.get_location_coordinates(location["name"], location["state_code"], location["country_code"])
+        results.append(fetcher.get_weather_locaiton_forecast_data_by_coordinates(location["name"], coordinates[0], coordinates[1]))
+    return results
+
+
+# Gibt 1 zurück, wenn ein Standort fehlt oder die Reihenfolge nicht stimmt
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Durchsatz des Vorhersage-Abrufs gegen einen lokalen Stub-Server messen.")
+    parser.add_argument("--locations", type=int, default=200, help="Anzahl Standorte")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulierte Latenz pro Anfrage in Sekunden")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Zu messende Parallelitätsstufen")
+    args = parser.parse_args()
+
+    locations = build_locations(args.locations)
+    fetcher   = WeatherDataFetcher()
+    fetcher.forecast_cache = None  # Jeder Durchlauf soll das Netzwerk treffen
+    fetcher.scheduler      = None  # Kein API-Kontingent gegenüber dem lokalen Server
+
+    errors = 0
+    with FakeOpenWeatherServer(latency=args.latency) as server:
+        server.configure(fetcher)
+
+        start    = time.perf_counter()
+        expected = fetch_sequential(fetcher, locations)
+        elapsed  = time.perf_counter() - start
+        print(f"{'sequenziell':>14}: {elapsed:7.3f} s  {len(locations) / elapsed:8.1f} Standorte/s")
+
+        for concurrency in args.concurrency:
+            start   = time.perf_counter()
+            results = fetcher.fetch_forecasts(locations, max_concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+
+            failed = sum(result is None for result in results)
+            in_order = all(
+                result is not None and result.location_name == reference.location_name and result.latitude == reference.latitude
+                for result, reference in zip(results, expected)
+            )
+            print(f"{f'parallel x{concurrency}':>14}: {elapsed:7.3f} s  {len(locations) / elapsed:8.1f} Standorte/s  (Fehler: {failed}, Reihenfolge ok: {in_order})")
+            errors += failed > 0 or not in_order
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# Import-Anweisung, Zeitbudget (Sekunden) und Module, die dabei nicht geladen werden dürfen
+CASES = [
+    ("import weather", 0.05, ["numpy", "pandas", "requests", "matplotlib", "seaborn", "pyarrow"]),
+    ("from weather import LocationWeatherData", 0.05, ["numpy", "pandas", "requests", "matplotlib", "seaborn"]),
+    ("from weather import WeatherDataFetcher", 0.35, ["numpy", "pandas", "matplotlib", "seaborn", "pyarrow"])
+]
+
+HEAVY_MODULES = ["numpy", "pandas", "requests", "dotenv", "matplotlib", "seaborn", "pyarrow"]
+
+# Wird in einem frischen Interpreter ausgeführt, damit keine Module aus früheren Messungen im Cache liegen
+MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": [name for name in {modules!r} if name in sys.modules]}}))
+"""
+
+
+# Misst die Importzeit einer Anweisung (bester Wert aus repeat frischen Prozessen) und die dabei geladenen Module
+def measure_import(statement: str, repeat: int = 5) -> tuple[float, list[str]]:
+    best, modules = float("inf"), []
+    for _ in range(repeat):
+        code   = MEASURE.format(statement=statement, modules=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if result["seconds"] < best:
+            best, modules = result["seconds"], result["modules"]
+    return best, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prüft, ob die Importzeiten des Pakets im Budget bleiben.")
+    parser.add_argument("--repeat", type=int, default=5, help="Anzahl frischer Prozesse pro Messung (bester Wert zählt)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Faktor für alle Budgets (z. B. 2 auf langsamen Maschinen)")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'Anweisung':<45} {'Zeit':>10} {'Budget':>10}  Geladen")
+    for statement, budget, forbidden in CASES:
+        seconds, modules = measure_import(statement, args.repeat)
+        budget *= args.scale
+        unexpected = [name for name in modules if name in forbidden]
+        status     = "ok" if seconds <= budget and not unexpected else "FEHLER"
+        failures  += status != "ok"
+
+        print(f"{statement:<45} {seconds * 1e3:>8.1f}ms {budget * 1e3:>8.0f}ms  {', '.join(modules) or '-'}  {status}")
+        if unexpected:
+            print(f"  unerwartet geladen: {', '.join(unexpected)}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import argparse
+import gc
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fake_server import build_onecall_payload
+from benchmarks.timing import measure_time
+from weather.helper import WeatherHelper
+from weather.models import ColumnarLocationWeatherData, LocationWeatherData, PrecipitationData, TemperatureData, WindData
+from weather.parser import ForecastParser
+
+
+# Baut ein objektbasiertes LocationWeatherData aus einer synthetischen One Call Antwort (wie der Fetcher)
+def build_object_location(index: int) -> LocationWeatherData:
+    payload = build_onecall_payload(index / 100, index / 50)
+    offset  = payload["timezone_offset"]
+    temperature_data, precipitation_data, wind_data = [], [], []
+    for day in payload["daily"]:
+        date = pd.Timestamp(day["dt"] + offset, unit="s").strftime(ForecastParser.date_format)
+        temp = day["temp"]
+        temperature_data.append(TemperatureData(
+            day["dt"], offset, date, temp["morn"], temp["day"], temp["eve"], temp["night"], temp["min"], temp["max"],
+            (temp["morn"] + temp["day"] + temp["eve"] + temp["night"]) / 4
+        ))
+        precipitation_data.append(PrecipitationData(day["dt"], offset, date, day["rain"], day["snow"], day["pop"]))
+        wind_data.append(WindData(day["dt"], offset, date, day["wind_speed"], day["wind_deg"]))
+    return LocationWeatherData(f"Station {index}", index / 100, index / 50, temperature_data, precipitation_data, wind_data)
+
+
+# Misst den zusätzlich belegten Speicher, während build() die Daten erzeugt
+def measure_memory(build) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speicherbedarf und DataFrame-Konvertierung: Objekte vs. Spalten.")
+    parser.add_argument("--locations", type=int, default=2000, help="Anzahl Standorte")
+    args = parser.parse_args()
+
+    helper  = WeatherHelper()
+    objects = [build_object_location(i) for i in range(args.locations)]
+
+    objects_copy, object_bytes = measure_memory(lambda: [build_object_location(i) for i in range(args.locations)])
+    columnar, columnar_bytes   = measure_memory(lambda: [ColumnarLocationWeatherData.from_location_weather_data(data) for data in objects])
+    del objects_copy
+
+    for data, fast in zip(objects[:10], columnar[:10]):
+        pd.testing.assert_frame_equal(helper.create_dataframe(data), helper.create_dataframe(fast))
+
+    object_time   = measure_time(lambda: [helper.create_dataframe(data) for data in objects])
+    columnar_time = measure_time(lambda: [helper.create_dataframe(data) for data in columnar])
+
+    print(f"Standorte: {args.locations}")
+    print(f"{'':>10}  {'Bytes/Standort':>15}  {'create_dataframe/Standort':>26}")
+    print(f"{'Objekte':>10}  {object_bytes / args.locations:15.0f}  {object_time / args.locations * 1e6:23.1f} µs")
+    print(f"{'Spalten':>10}  {columnar_bytes / args.locations:15.0f}  {columnar_time / args.locations * 1e6:23.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+
+import pandas as pd
+
+from benchmarks.generators import build_responses
+from benchmarks.timing import measure_time
+from weather.helper import WeatherHelper
+from weather.parser import ForecastParser
+
+
+# Prüft, dass der spaltenbasierte Parser exakt dieselben DataFrames liefert wie der Objekt-Pfad
+def check_equal(parser: ForecastParser, helper: WeatherHelper, responses: list):
+    expected = [helper.create_dataframe(parser.parse_daily_objects(*response)) for response in responses]
+    for frame, response in zip(expected, responses):
+        pd.testing.assert_frame_equal(frame, helper.create_dataframe(parser.parse_daily(*response)))
+
+    batch = parser.parse_batch(responses)
+    for frame, (location_name, _, _, _) in zip(expected, responses):
+        part = batch[batch["location_name"] == location_name][frame.columns].reset_index(drop=True)
+        pd.testing.assert_frame_equal(frame, part, check_dtype=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-Benchmark: objektbasierter vs. spaltenbasierter Parser für One Call \"daily\".")
+    parser.add_argument("--locations", type=int, nargs="+", default=[10, 100, 1000], help="Anzahl Antworten pro Messung")
+    args = parser.parse_args()
+
+    forecast_parser = ForecastParser()
+    helper          = WeatherHelper()
+    check_equal(forecast_parser, helper, build_responses(30))
+
+    print(f"{'Standorte':>10}  {'Objekte + create_dataframe':>27}  {'Spalten + to_dataframe':>23}  {'parse_batch':>12}")
+    for count in args.locations:
+        responses = build_responses(count)
+        objects   = measure_time(lambda: [helper.create_dataframe(forecast_parser.parse_daily_objects(*response)) for response in responses])
+        columnar  = measure_time(lambda: [forecast_parser.parse_daily(*response).to_dataframe() for response in responses])
+        batch     = measure_time(lambda: forecast_parser.parse_batch(responses))
+        print(f"{count:>10}  {objects * 1e3:24.1f} ms  {columnar * 1e3:20.1f} ms  {batch * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
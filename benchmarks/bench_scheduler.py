@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.fake_server import FakeOpenWeatherServer
+
+os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+
+from weather import WeatherDataFetcher
+from weather.scheduler import RequestScheduler
+
+
+# Spielt einen Batch gegen einen lokalen Server ab, der zu Beginn gescriptete 429/5xx-Antworten liefert,
+# und prüft, dass trotz Drosselung kein Standort verloren geht (Rückgabewert 1, wenn doch oder bei falscher Reihenfolge).
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scheduler mit Kontingent und Backoff gegen gescriptete 429/5xx-Antworten prüfen.")
+    parser.add_argument("--locations", type=int, default=50, help="Anzahl Standorte")
+    parser.add_argument("--calls-per-minute", type=float, default=600, help="Kontingent pro Minute")
+    parser.add_argument("--errors", type=int, default=20, help="Anzahl gescripteter Fehlerantworten")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallelität")
+    args = parser.parse_args()
+
+    locations = [{"name": f"Station {i}", "country_code": "CH"} for i in range(args.locations)]
+    script    = [429 if i % 3 else 503 for i in range(args.errors)]
+
+    fetcher = WeatherDataFetcher()
+    fetcher.forecast_cache = None
+    scheduler = RequestScheduler(calls_per_minute=args.calls_per_minute, backoff_base=0.05, backoff_max=1.0)
+    fetcher.scheduler = scheduler
+
+    with FakeOpenWeatherServer(script=script, retry_after=0.1) as server:
+        server.configure(fetcher)
+
+        start   = time.perf_counter()
+        results = fetcher.fetch_forecasts(locations, max_concurrency=args.concurrency)
+        elapsed = time.perf_counter() - start
+
+        # Ohne Wiederholungen gehen Standorte verloren; resume_from holt nur diese nach
+        fetcher.scheduler = RequestScheduler(calls_per_minute=None, max_retries=0)
+        server.add_script([429] * 5)
+        partial = fetcher.fetch_forecasts(locations, max_concurrency=args.concurrency)
+        lost    = sum(result is None for result in partial)
+        resumed = fetcher.fetch_forecasts(locations, max_concurrency=args.concurrency, resume_from=partial)
+
+    failed   = sum(result is None for result in results)
+    missing  = sum(result is None for result in resumed)
+    in_order = all(
+        result is None or result.location_name == location["name"]
+        for results_ in (results, resumed) for result, location in zip(results_, locations)
+    )
+    print(f"Standorte: {len(locations)}, gescriptete Fehler: {len(script)}, fehlgeschlagen: {failed}, Dauer: {elapsed:.2f} s")
+    for key, value in scheduler.stats().items():
+        print(f"  {key}: {value:.3f}" if isinstance(value, float) else f"  {key}: {value}")
+    print(f"Ohne Wiederholungen verloren: {lost}, nach resume_from fehlend: {missing}, Reihenfolge ok: {in_order}")
+    return 1 if failed or missing or not in_order else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+# Erzeugt eine synthetische One Call Antwort ("daily", 8 Tage) für die angegebenen Koordinaten
+def build_onecall_payload(latitude: float, longitude: float, days: int = 8, start: int = 1735732800) -> dict:
+    seed  = (round(latitude * 100) * 31 + round(longitude * 100)) % 40
+    daily = []
+    for i in range(days):
+        base = seed - 10 + i * 0.5
+        daily.append({
+            "dt": start + i * 86400,
+            "temp": {
+                "morn": base - 2.0,
+                "day": base + 3.0,
+                "eve": base + 1.0,
+                "night": base - 4.0,
+                "min": base - 5.0,
+                "max": base + 4.0
+            },
+            "rain": round((seed + i) % 7 * 1.3, 1),
+            "snow": 0,
+            "pop": ((seed + i) % 10) / 10,
+            "wind_speed": 2.0 + (seed + i) % 9,
+            "wind_deg": (seed * 13 + i * 40) % 360
+        })
+    return {
+        "lat": latitude,
+        "lon": longitude,
+        "timezone": "UTC",
+        "timezone_offset": 3600,
+        "daily": daily
+    }
+
+
+# Erzeugt deterministische Koordinaten für eine Geo-Abfrage ("Stadt,Bundesland,Land")
+def build_geo_payload(query: str) -> list[dict]:
+    checksum = zlib.crc32(query.encode("utf-8"))
+    return [{
+        "name": query.split(",")[0],
+        "lat": round((checksum % 18000) / 100 - 90, 4),
+        "lon": round((checksum // 18000 % 36000) / 100 - 180, 4)
+    }]
+
+
+class _FakeOpenWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version        = "HTTP/1.1"  # Keep-Alive, damit Verbindungspools wirksam sind
+    disable_nagle_algorithm = True        # Verhindert künstliche Verzögerungen bei kleinen Antworten
+
+    def do_GET(self):
+        server = self.server
+        url    = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        with server.lock:
+            server.request_count += 1
+            status = server.script.pop(0) if server.script else 200
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if status != 200:
+            self._send_json(status, {"cod": status, "message": "Scripted error"}, {"Retry-After": server.retry_after} if server.retry_after is not None else None)
+            return
+
+        if url.path == "/geo/1.0/direct":
+            self._send_json(200, build_geo_payload(params.get("q", "")))
+        elif url.path == "/data/3.0/onecall":
+            self._send_json(200, build_onecall_payload(float(params["lat"]), float(params["lon"])))
+        else:
+            self._send_json(404, {"message": "Not found"})
+
+    def _send_json(self, status: int, payload, headers: dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Unterdrückt die Zugriffsprotokollierung auf stderr
+    def log_message(self, format, *args):
+        pass
+
+
+# Lokaler HTTP-Server, der die Geo- und One Call Endpunkte von OpenWeatherMap nachbildet.
+# Verwendung als Kontextmanager; latency simuliert die Round-Trip-Zeit pro Anfrage in Sekunden.
+# script ist eine Liste von Statuscodes (z. B. [429, 429, 503]), die den nächsten Anfragen der Reihe nach
+# statt einer normalen Antwort geliefert werden; retry_after setzt dabei den "Retry-After"-Header.
+class FakeOpenWeatherServer:
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0, script: list[int] = None, retry_after: float = None):
+        self.httpd = ThreadingHTTPServer((host, port), _FakeOpenWeatherHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency        = latency
+        self.httpd.script         = list(script or [])
+        self.httpd.retry_after    = retry_after
+        self.httpd.request_count  = 0
+        self.httpd.lock           = threading.Lock()
+        self._thread              = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def geo_url(self) -> str:
+        return f"{self.base_url}/geo/1.0/direct"
+
+    @property
+    def onecall_url(self) -> str:
+        return f"{self.base_url}/data/3.0/onecall"
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    # Hängt weitere Statuscodes an das Skript an
+    def add_script(self, statuses: list[int]):
+        with self.httpd.lock:
+            self.httpd.script.extend(statuses)
+
+    # Leitet die Endpunkte eines Fetchers auf diesen Server um
+    def configure(self, fetcher):
+        fetcher.geo_base_url     = self.geo_url
+        fetcher.onecall_base_url = self.onecall_url
+        return fetcher
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
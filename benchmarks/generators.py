@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.fake_server import build_onecall_payload
+
+
+# Erzeugt eine Liste synthetischer Standorte im Format der Notebooks
+def build_locations(count: int) -> list[dict]:
+    return [{"name": f"Station {i}", "state_code": "ZH", "country_code": "CH"} for i in range(count)]
+
+
+# Synthetische One Call Antworten als (Standortname, Breite, Länge, Antwort), wie sie der Fetcher an den Parser übergibt.
+# Bei jeder dry_every-ten Antwort fehlen "rain"/"snow" wie bei trockenen Tagen der echten API (0: nie).
+def build_responses(count: int, days: int = 8, dry_every: int = 3) -> list[tuple[str, float, float, dict]]:
+    responses = []
+    for i in range(count):
+        latitude, longitude = i / 100, i / 50
+        payload = build_onecall_payload(latitude, longitude, days)
+        if dry_every and i % dry_every == 0:
+            for day in payload["daily"]:
+                day.pop("rain")
+                day.pop("snow")
+        responses.append((f"Station {i}", latitude, longitude, payload))
+    return responses
+
+
+# Schreibt eine CSV-Datei im Format von data/wetterdaten_2024_drei_staedte.csv (DATE,TAVG,TMAX,TMIN,PRCP,CITY)
+# mit months Monaten pro Standort ab start. Ein Anteil missing der Messwerte fehlt, damit auch die Ersetzung
+# fehlender Werte gemessen wird. Gibt die Anzahl geschriebener Zeilen zurück.
+def write_csv(file_path: str, stations: int, months: int = 12, start: str = "2024-01", missing: float = 0.01, seed: int = 0) -> int:
+    rng    = np.random.default_rng(seed)
+    dates  = pd.period_range(start, periods=months, freq="M").strftime("%Y-%m")
+    rows   = stations * months
+    season = -np.cos(2 * np.pi * (np.arange(months) % 12) / 12)
+
+    temp_avg = np.repeat(rng.uniform(-5, 20, stations), months) + np.tile(10 * season, stations) + rng.normal(0, 1.5, rows)
+    df = pd.DataFrame({
+        "DATE": np.tile(dates, stations),
+        "TAVG": temp_avg.round(1),
+        "TMAX": (temp_avg + rng.uniform(2, 6, rows)).round(1),
+        "TMIN": (temp_avg - rng.uniform(2, 6, rows)).round(1),
+        "PRCP": rng.gamma(2, 35, rows).round(1),
+        "CITY": np.repeat([f"Station {i}" for i in range(stations)], months)
+    })
+    for column in ("TAVG", "TMAX", "TMIN", "PRCP"):
+        df.loc[rng.random(rows) < missing, column] = np.nan
+
+    df.to_csv(file_path, index=False)
+    return rows
@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import warnings
+from datetime import datetime
+from functools import cached_property
+
+os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+
+from benchmarks.fake_server import FakeOpenWeatherServer
+from benchmarks.generators import build_locations, build_responses, write_csv
+from benchmarks.timing import measure_runs
+from weather import CsvWeatherReader, ForecastParser, WeatherDataFetcher, WeatherHelper, WeatherPlotter
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+# Synthetische Daten für eine Anzahl Standorte (scale). Jede Eingabe wird erst erzeugt, wenn ein Fall sie braucht,
+# und danach für alle weiteren Fälle derselben Grösse wiederverwendet; Dateien und Plots landen in workdir.
+class Workload:
+    def __init__(self, scale: int, workdir: str):
+        self.scale   = scale
+        self.workdir = workdir
+        self.parser  = ForecastParser()
+        self.helper  = WeatherHelper()
+        self.reader  = CsvWeatherReader()
+        self._server = None
+
+    @cached_property
+    def fetcher(self) -> WeatherDataFetcher:
+        fetcher = WeatherDataFetcher()
+        fetcher.geocoding_cache = None  # Jeder Durchlauf soll den Server treffen
+        fetcher.forecast_cache  = None
+        fetcher.scheduler       = None  # Kein API-Kontingent gegenüber dem lokalen Server
+        return fetcher
+
+    @cached_property
+    def locations(self) -> list[dict]:
+        return build_locations(self.scale)
+
+    @cached_property
+    def responses(self) -> list:
+        return build_responses(self.scale)
+
+    @cached_property
+    def parsed(self) -> list:
+        return [self.parser.parse_daily(*response) for response in self.responses]
+
+    @cached_property
+    def dataframes(self) -> list:
+        return [self.helper.create_dataframe(data) for data in self.parsed]
+
+    # Normalisierte Vorhersagen ({Standort: DataFrame}) für die Plots der API-Daten
+    @cached_property
+    def api_data(self) -> dict:
+        normalized = self.helper.normalize_dataframes_on_date(self.dataframes)
+        return {data.location_name: df for data, df in zip(self.parsed, normalized)}
+
+    @cached_property
+    def csv_file(self) -> str:
+        file_path = os.path.join(self.workdir, f"stations_{self.scale}.csv")
+        write_csv(file_path, self.scale)
+        return file_path
+
+    # Monatswerte aus der CSV-Datei ({Standort: DataFrame}) für die Heatmaps
+    @cached_property
+    def csv_data(self) -> dict:
+        instances = self.reader.get_weather_data_from_csv(self.csv_file)
+        return {instance.location_name: self.helper.create_dataframe(instance) for instance in instances}
+
+    @cached_property
+    def plot_dir(self) -> str:
+        return os.path.join(self.workdir, "plots")
+
+    def fetch(self) -> list:
+        if self._server is None:
+            self._server = FakeOpenWeatherServer().start()
+            self._server.configure(self.fetcher)
+        return self.fetcher.fetch_forecasts(self.locations, max_concurrency=32)
+
+    def plot(self, call):
+        with WeatherPlotter(self.plot_dir) as plotter:
+            call(plotter, self)
+
+    def close(self):
+        if self._server is not None:
+            self._server.stop()
+
+
+# Plotter-Methoden: Name, maximale Anzahl Standorte, verwendete Daten und Aufruf mit (plotter, workload).
+# Ein Plot mit einer Linie bzw. Heatmap-Zeile pro Standort ist über ~1000 Standorte weder lesbar noch in
+# vertretbarer Zeit zu rendern; die Grenzen lassen sich mit --no-limit aufheben.
+PLOTS = [
+    ("plot_temperatures_by_time_of_day", 1000, "api_data", lambda plotter, w: plotter.plot_temperatures_by_time_of_day(w.api_data, "day")),
+    ("plot_min_max_temperatures", 1000, "api_data", lambda plotter, w: plotter.plot_min_max_temperatures(w.api_data)),
+    ("plot_avg_temperatures", 1000, "api_data", lambda plotter, w: plotter.plot_avg_temperatures(w.api_data)),
+    ("plot_wind_speed", 1000, "api_data", lambda plotter, w: plotter.plot_wind_speed(w.api_data)),
+    ("plot_total_rain", 1000, "api_data", lambda plotter, w: plotter.plot_total_rain(w.api_data)),
+    ("plot_total_snow", 1000, "api_data", lambda plotter, w: plotter.plot_total_snow(w.api_data)),
+    ("plot_combined_heatmap", 1000, "csv_data", lambda plotter, w: plotter.plot_combined_heatmap(w.csv_data)),
+    ("plot_city_heatmap", None, "csv_data", lambda plotter, w: plotter.plot_city_heatmap("Station 0", w.csv_data["Station 0"])),
+    ("plot_city_heatmaps", 100, "csv_data", lambda plotter, w: plotter.plot_city_heatmaps(w.csv_data))
+]
+
+# Gemessene Fälle: Name, maximale Anzahl Standorte (None: unbegrenzt), Eingaben des Workloads, die vor der Messung
+# erzeugt werden, und Funktion, die den Workload verarbeitet
+CASES = [
+    ("csv.get_weather_data_from_csv", None, ("csv_file",), lambda w: w.reader.get_weather_data_from_csv(w.csv_file)),
+    ("parser.parse_daily", None, ("responses",), lambda w: [w.parser.parse_daily(*response) for response in w.responses]),
+    ("parser.parse_batch", None, ("responses",), lambda w: w.parser.parse_batch(w.responses)),
+    ("helper.create_dataframe", None, ("parsed",), lambda w: [w.helper.create_dataframe(data) for data in w.parsed]),
+    ("helper.normalize_dataframes_on_date", None, ("dataframes",), lambda w: w.helper.normalize_dataframes_on_date(w.dataframes)),
+    ("fetcher.fetch_forecasts", 1000, ("locations", "fetcher"), lambda w: w.fetch()),
+    *[(f"plotter.{name}", limit, (source,), lambda w, call=call: w.plot(call)) for name, limit, source, call in PLOTS]
+]
+
+
+# Beschreibung der Umgebung, damit gespeicherte Ergebnisse nachvollziehbar bleiben
+def environment() -> dict:
+    import matplotlib
+    import numpy
+    import pandas
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "matplotlib": matplotlib.__version__
+    }
+
+
+def run(scales: list[int], patterns: list[str], repeat: int, budget: float, no_limit: bool) -> list[dict]:
+    cases   = [case for case in CASES if not patterns or any(pattern in case[0] for pattern in patterns)]
+    results = []
+
+    # Legenden mit sehr vielen Standorten passen nicht in tight_layout; die Warnung pro Plot stört nur die Tabelle
+    warnings.filterwarnings("ignore", "Tight layout not applied", UserWarning)
+
+    print(f"{'Fall':<42} {'Standorte':>10} {'Zeit':>12} {'pro Standort':>14} {'Läufe':>6}")
+    for scale in scales:
+        workdir  = tempfile.mkdtemp(prefix="weather-bench-")
+        workload = Workload(scale, workdir)
+        try:
+            for name, limit, inputs, function in cases:
+                if limit is not None and scale > limit and not no_limit:
+                    print(f"{name:<42} {scale:>10} {'übersprungen':>12}  (Grenze {limit} Standorte, --no-limit)")
+                    continue
+
+                for attribute in inputs:
+                    getattr(workload, attribute)
+                seconds, runs = measure_runs(lambda: function(workload), repeat, budget)
+                results.append({"case": name, "scale": scale, "seconds": seconds, "runs": runs})
+                print(f"{name:<42} {scale:>10} {seconds * 1e3:>10.1f}ms {seconds / scale * 1e6:>12.1f}µs {runs:>6}")
+        finally:
+            workload.close()
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# Vergleicht zwei Ergebnisdateien Fall für Fall. Ein Fall gilt als langsamer, wenn er mehr als threshold (relativ)
+# und mehr als 1 ms länger dauert. Gibt die Anzahl langsamerer Fälle zurück.
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    previous    = {(result["case"], result["scale"]): result["seconds"] for result in baseline["results"]}
+    regressions = 0
+
+    print(f"Vergleich mit {baseline['environment'].get('commit') or '?'} vom {baseline['environment']['timestamp']}")
+    print(f"{'Fall':<42} {'Standorte':>10} {'vorher':>12} {'nachher':>12} {'Faktor':>8}")
+    for result in current["results"]:
+        before = previous.get((result["case"], result["scale"]))
+        if before is None:
+            continue
+
+        after   = result["seconds"]
+        slower  = after > before * (1 + threshold) and after - before > 1e-3
+        faster  = before > after * (1 + threshold) and before - after > 1e-3
+        status  = "langsamer" if slower else "schneller" if faster else ""
+        regressions += slower
+        print(f"{result['case']:<42} {result['scale']:>10} {before * 1e3:>10.1f}ms {after * 1e3:>10.1f}ms {before / after:>7.2f}x  {status}")
+    return regressions
+
+
+def load(file_path: str) -> dict:
+    with open(file_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reproduzierbare Benchmarks der Pipeline mit synthetischen Daten.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 1000, 100_000], help="Anzahl Standorte pro Messreihe")
+    parser.add_argument("--cases", nargs="+", default=[], help="Nur Fälle, deren Name einen der Texte enthält (z. B. parser plotter)")
+    parser.add_argument("--repeat", type=int, default=3, help="Maximale Anzahl Durchläufe pro Messung (bester Wert zählt)")
+    parser.add_argument("--budget", type=float, default=10.0, help="Keine weiteren Durchläufe, sobald eine Messung so viele Sekunden gedauert hat")
+    parser.add_argument("--no-limit", action="store_true", help="Plots und Abruf auch über ihrer Grenze an Standorten messen")
+    parser.add_argument("--output", help="Ergebnisdatei (Standard: benchmarks/results/<Zeitstempel>.json)")
+    parser.add_argument("--baseline", help="Ergebnisse nach dem Lauf mit dieser Datei vergleichen")
+    parser.add_argument("--compare", nargs=2, metavar=("VORHER", "NACHHER"), help="Zwei gespeicherte Ergebnisdateien vergleichen, ohne zu messen")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative Verlangsamung, ab der ein Fall als langsamer gilt (Standard: 0.1)")
+    args = parser.parse_args()
+
+    if args.compare:
+        return 1 if compare(load(args.compare[0]), load(args.compare[1]), args.threshold) else 0
+
+    current = {
+        "environment": environment(),
+        "settings": {"scales": args.scales, "repeat": args.repeat, "budget": args.budget, "no_limit": args.no_limit},
+        "results": run(args.scales, args.cases, args.repeat, args.budget, args.no_limit)
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(current, file, indent=2)
+    print(f"Ergebnisse gespeichert: {output}")
+
+    if args.baseline:
+        return 1 if compare(load(args.baseline), current, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+import time
+
+
+# Bester Wert (Sekunden) aus höchstens repeat Durchläufen; weitere Durchläufe entfallen, sobald budget Sekunden
+# verbraucht sind. Gibt die beste Zeit und die Anzahl Durchläufe zurück.
+def measure_runs(function, repeat: int = 3, budget: float = float("inf")) -> tuple[float, int]:
+    times = []
+    while len(times) < repeat and sum(times) < budget:
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), len(times)
+
+
+# Beste Zeit (Sekunden) aus repeat Durchläufen
+def measure_time(function, repeat: int = 3) -> float:
+    return measure_runs(function, repeat)[0]
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from benchmarks.fake_server import FakeOpenWeatherServer, build_geo_payload
+from weather.fetcher import WeatherClient
+
+
+# Simulierte Uhr: sleep() wartet nicht, sondern stellt die Uhr vor und merkt sich die Wartezeiten
+class FakeClock:
+    def __init__(self):
+        self.now    = 0.0
+        self.sleeps = []
+        self._lock  = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            return self.now
+
+    # Ersatz für time.time(), wenn die Uhr an Stelle des time-Moduls eingesetzt wird
+    def time(self) -> float:
+        return self()
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self.now += seconds
+            self.sleeps.append(seconds)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def server():
+    with FakeOpenWeatherServer() as server:
+        yield server
+
+
+# Erstellt WeatherClients, die gegen den lokalen Stub-Server arbeiten
+@pytest.fixture
+def make_client(server):
+    def make_client(scheduler=None) -> WeatherClient:
+        return server.configure(WeatherClient("key", scheduler=scheduler))
+
+    return make_client
+
+
+# Entfernt in der Antwort des Standorts name die Morgentemperatur eines Tages (wie eine unvollständige API-Antwort)
+@pytest.fixture
+def corrupt_forecast(monkeypatch):
+    def corrupt_forecast(client: WeatherClient, name: str):
+        latitude = build_geo_payload(f"{name},ZH,CH")[0]["lat"]
+        load     = client._get_forecast_payload
+
+        def corrupted(lat: float, lon: float) -> dict:
+            data = load(lat, lon)
+            if lat == latitude:
+                del data["daily"][3]["temp"]["morn"]
+            return data
+
+        monkeypatch.setattr(client, "_get_forecast_payload", corrupted)
+
+    return corrupt_forecast
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from benchmarks.generators import build_responses
+from weather.aggregates import AggregateCube
+from weather.helper import WeatherHelper
+from weather.parser import ForecastParser
+
+
+@pytest.fixture
+def location_data() -> dict:
+    parser, helper = ForecastParser(), WeatherHelper()
+    return {response[0]: helper.create_dataframe(parser.parse_daily(*response)) for response in build_responses(5)}
+
+
+def test_selected_measures_match_the_full_cube(location_data):
+    full = AggregateCube.from_location_data(location_data)
+    rain = AggregateCube.from_location_data(location_data, ("rain",), daily=False)
+
+    pd.testing.assert_series_equal(rain.totals("rain"), full.totals("rain"))
+    pd.testing.assert_series_equal(rain.totals("rain"), pd.Series({name: df["rain"].sum() for name, df in location_data.items()}, name="rain").rename_axis("location"), check_dtype=False)
+    with pytest.raises(KeyError):
+        rain.totals("snow")
+    with pytest.raises(KeyError):
+        rain.day_of_year("rain")
+
+
+def test_update_only_adds_new_days(location_data):
+    cube  = AggregateCube()
+    first = {name: df.iloc[:5] for name, df in location_data.items()}
+
+    assert cube.update(first) == dict.fromkeys(location_data, 5)
+    assert cube.update(location_data) == dict.fromkeys(location_data, 3)
+    pd.testing.assert_frame_equal(cube.monthly("temp_avg"), AggregateCube.from_location_data(location_data).monthly("temp_avg"))
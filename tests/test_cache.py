@@ -0,0 +1,173 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from weather import cache as cache_module
+from weather.cache import DiskCacheBackend, ForecastCache, GeocodingCache, MemoryCacheBackend
+
+PARAMS = {"lat": 47.37, "lon": 8.54, "appid": "key"}
+
+
+@pytest.fixture
+def disk_backend(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path / "forecasts.sqlite"))
+    yield backend
+    backend.close()
+
+
+# Ersetzt das time-Modul im Cache durch die simulierte Uhr, die nur mit sleep() weiterläuft
+@pytest.fixture
+def cache_clock(clock, monkeypatch):
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def geocoding(tmp_path):
+    cache = GeocodingCache(str(tmp_path / "geocoding.sqlite"), ttl=3600, max_entries=3)
+    yield cache
+    cache.close()
+
+
+# Lädt erst, wenn release gesetzt ist, damit sich alle Threads vorher beim Cache anmelden können
+class SlowLoader:
+    def __init__(self, payload: bytes = b"payload", error: Exception = None):
+        self.payload = payload
+        self.error   = error
+        self.calls   = 0
+        self.release = threading.Event()
+
+    def __call__(self) -> bytes:
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.payload
+
+
+def fetch_concurrently(cache: ForecastCache, loader: SlowLoader, threads: int = 8) -> list:
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(cache.fetch, PARAMS, loader) for _ in range(threads)]
+        time.sleep(0.2)
+        loader.release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_misses_load_once():
+    cache  = ForecastCache(MemoryCacheBackend())
+    loader = SlowLoader()
+
+    results = fetch_concurrently(cache, loader)
+
+    assert results == [b"payload"] * 8
+    assert loader.calls == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"] + stats["coalesced"]) == (1, 7)
+
+
+def test_failed_load_reaches_every_waiter_and_is_retried():
+    cache  = ForecastCache(MemoryCacheBackend())
+    loader = SlowLoader(error=ConnectionError("offline"))
+
+    results = fetch_concurrently(cache, loader)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert loader.calls == 1
+    assert cache.fetch(PARAMS, lambda: b"retry") == b"retry"
+
+
+def test_disk_backend_keeps_the_newest_entries(disk_backend):
+    disk_backend.ttl            = None
+    disk_backend.max_entries    = 3
+    disk_backend.evict_interval = 1
+
+    for i in range(5):
+        disk_backend.set(f"key{i}", b"x", stored_at=1000.0 + i)
+
+    assert len(disk_backend) == 3
+    assert disk_backend.get("key1") is None
+    assert disk_backend.get("key4") == (b"x", 1004.0)
+
+
+def test_disk_backend_removes_expired_entries_on_open(tmp_path):
+    path = str(tmp_path / "forecasts.sqlite")
+    backend = DiskCacheBackend(path, ttl=None)
+    backend.set("old", b"x", time.time() - 7200)
+    backend.set("new", b"y", time.time())
+    backend.close()
+
+    backend = DiskCacheBackend(path, ttl=3600)
+    try:
+        assert backend.get("old") is None
+        assert backend.get("new")[0] == b"y"
+    finally:
+        backend.close()
+
+
+def test_geocoding_counts_hits_and_misses(geocoding, cache_clock):
+    geocoding.set("Zürich", "ZH", "CH", (47.37, 8.54))
+
+    assert geocoding.get(" zürich ", "zh", "ch") == (47.37, 8.54)
+    assert geocoding.get("Bern", None, "CH") is None
+    assert geocoding.get("Zürich", "ZH", "CH") == (47.37, 8.54)
+    assert geocoding.stats() == {"hits": 2, "misses": 1, "hit_ratio": 2 / 3, "entries": 1}
+
+
+def test_geocoding_entries_expire_after_ttl(geocoding, cache_clock):
+    geocoding.set("Zürich", "ZH", "CH", (47.37, 8.54))
+
+    cache_clock.sleep(3599)
+    assert geocoding.get("Zürich", "ZH", "CH") == (47.37, 8.54)
+    cache_clock.sleep(2)
+    assert geocoding.get("Zürich", "ZH", "CH") is None
+    assert len(geocoding) == 0
+
+
+def test_geocoding_evicts_the_least_recently_used_entry(geocoding, cache_clock):
+    for city in ("A", "B", "C"):
+        geocoding.set(city, None, "CH", (1.0, 2.0))
+        cache_clock.sleep(1)
+
+    # Der Treffer auf A wird erst beim nächsten set_many geschrieben, aber vor dem Entfernen berücksichtigt
+    geocoding.get("A", None, "CH")
+    cache_clock.sleep(1)
+    geocoding.set("D", None, "CH", (3.0, 4.0))
+
+    assert [geocoding.get(city, None, "CH") is not None for city in ("A", "B", "C", "D")] == [True, False, True, True]
+
+
+def test_geocoding_access_times_survive_reopening(tmp_path, cache_clock):
+    path  = str(tmp_path / "geocoding.sqlite")
+    cache = GeocodingCache(path, max_entries=2)
+    cache.set("A", None, "CH", (1.0, 2.0))
+    cache_clock.sleep(1)
+    cache.set("B", None, "CH", (3.0, 4.0))
+    cache_clock.sleep(1)
+    cache.get("A", None, "CH")
+    cache.close()
+
+    cache = GeocodingCache(path, max_entries=2)
+    try:
+        cache.set("C", None, "CH", (5.0, 6.0))
+        assert cache.get("A", None, "CH") == (1.0, 2.0)
+        assert cache.get("B", None, "CH") is None
+    finally:
+        cache.close()
+
+
+def test_geocoding_preload_from_csv(geocoding, tmp_path):
+    file_path = tmp_path / "standorte.csv"
+    file_path.write_text(
+        "name,state_code,country_code,lat,lon\n"
+        "Zürich,ZH,CH,47.37,8.54\n"
+        "Bern,,CH,46.95,7.45\n"
+        "Ohne Koordinaten,,CH,,\n",
+        encoding="utf-8"
+    )
+
+    assert geocoding.preload_from_csv(str(file_path)) == 2
+    assert geocoding.get("Zürich", "ZH", "CH") == (47.37, 8.54)
+    assert geocoding.get("Bern", None, "CH") == (46.95, 7.45)
+    assert geocoding.get("Ohne Koordinaten", None, "CH") is None
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.generators import write_csv
+from weather.csv_reader import CsvWeatherReader
+
+
+@pytest.fixture
+def contiguous_csv(tmp_path) -> str:
+    file_path = str(tmp_path / "contiguous.csv")
+    write_csv(file_path, stations=20, months=12)
+    return file_path
+
+
+# Dieselben Zeilen in zufälliger Reihenfolge: die Zeilen eines Standorts sind über die ganze Datei verteilt
+@pytest.fixture
+def shuffled_csv(tmp_path, contiguous_csv) -> str:
+    file_path = str(tmp_path / "shuffled.csv")
+    df = pd.read_csv(contiguous_csv)
+    df.sample(frac=1, random_state=0).to_csv(file_path, index=False)
+    return file_path
+
+
+def frames(instances) -> list[tuple[str, pd.DataFrame]]:
+    return [(instance.location_name, instance.to_dataframe()) for instance in instances]
+
+
+def assert_same_locations(streamed, expected):
+    assert [name for name, _ in streamed] == [name for name, _ in expected]
+    for (_, left), (_, right) in zip(streamed, expected):
+        pd.testing.assert_frame_equal(left, right)
+
+
+@pytest.mark.parametrize("file", ["contiguous_csv", "shuffled_csv"])
+@pytest.mark.parametrize("sort", [True, False])
+@pytest.mark.parametrize("max_spill_files", [256, 4])
+def test_streaming_matches_the_eager_reader(request, file, sort, max_spill_files):
+    file_path = request.getfixturevalue(file)
+    reader    = CsvWeatherReader()
+    reader.max_spill_files = max_spill_files
+
+    streamed = frames(reader.iter_weather_data_from_csv(file_path, chunksize=7, sort=sort))
+    expected = frames(reader.get_weather_data_from_csv(file_path, sort=sort))
+
+    assert len(streamed) == 20
+    assert_same_locations(streamed, expected)
+
+
+def test_locations_are_sorted_by_name_by_default(shuffled_csv):
+    names = [instance.location_name for instance in CsvWeatherReader().iter_weather_data_from_csv(shuffled_csv, chunksize=7)]
+
+    assert names == sorted(names)
+
+
+def test_file_order_follows_the_first_occurrence(shuffled_csv):
+    first = pd.read_csv(shuffled_csv)["CITY"].drop_duplicates().tolist()
+
+    names = [instance.location_name for instance in CsvWeatherReader().iter_weather_data_from_csv(shuffled_csv, chunksize=7, sort=False)]
+
+    assert names == first
+    assert not np.array_equal(names, sorted(names))
@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.generators import build_locations
+from weather.cache import ForecastCache, MemoryCacheBackend
+from weather.fetcher import WeatherClient, WeatherDataFetcher
+from weather.scheduler import RequestScheduler
+from weather.singleton import Singleton
+
+
+# Umgebung ohne .env-Datei und ohne OPENWEATHER_*-Variablen
+@pytest.fixture
+def environment(monkeypatch):
+    import dotenv
+
+    monkeypatch.setattr(dotenv, "load_dotenv", lambda *args, **kwargs: False)
+    for name in list(os.environ):
+        if name.startswith("OPENWEATHER_"):
+            monkeypatch.delenv(name)
+    return monkeypatch
+
+
+# Noch nicht erstellter WeatherDataFetcher; eine bereits vorhandene Instanz wird danach wiederhergestellt
+@pytest.fixture
+def fresh_fetcher(environment):
+    environment.setenv("OPENWEATHER_API_KEY", "key")
+    previous = Singleton._instances.pop(WeatherDataFetcher, None)
+    yield
+    Singleton._instances.pop(WeatherDataFetcher, None)
+    if previous is not None:
+        Singleton._instances[WeatherDataFetcher] = previous
+
+
+def names(results) -> list:
+    return [result.location_name if result is not None else None for result in results]
+
+
+def test_batch_keeps_input_order(make_client):
+    locations = build_locations(30)
+
+    results = make_client().fetch_forecasts(locations, max_concurrency=8)
+
+    assert names(results) == [location["name"] for location in locations]
+    assert all(len(result) == 8 for result in results)
+
+
+def test_scripted_throttling_loses_no_location(server, make_client, clock):
+    scheduler = RequestScheduler(calls_per_minute=600, backoff_base=0.05, sleep=clock.sleep, clock=clock)
+    locations = build_locations(40)
+    server.httpd.retry_after = 0.1
+    server.add_script([429 if i % 3 else 503 for i in range(20)])
+
+    results = make_client(scheduler).fetch_forecasts(locations, max_concurrency=8)
+
+    assert names(results) == [location["name"] for location in locations]
+    assert server.request_count == 2 * len(locations) + 20
+    assert scheduler.stats()["retries"] == 20
+
+
+def test_resume_from_only_fetches_failed_locations(server, make_client):
+    client    = make_client(RequestScheduler(calls_per_minute=None, max_retries=0))
+    locations = build_locations(20)
+    server.add_script([429] * 5)
+
+    partial = client.fetch_forecasts(locations, max_concurrency=1)
+    lost    = [i for i, result in enumerate(partial) if result is None]
+    assert lost
+
+    before  = server.request_count
+    resumed = client.fetch_forecasts(locations, max_concurrency=4, resume_from=partial)
+
+    assert names(resumed) == [location["name"] for location in locations]
+    assert server.request_count - before == 2 * len(lost)
+    assert all(resumed[i] is partial[i] for i in range(len(locations)) if i not in lost)
+
+
+def test_resume_from_must_match_locations(make_client):
+    with pytest.raises(ValueError):
+        make_client().fetch_forecasts(build_locations(3), resume_from=[None])
+
+
+def test_malformed_payload_only_loses_its_location(make_client, corrupt_forecast):
+    client    = make_client()
+    locations = build_locations(4)
+    corrupt_forecast(client, "Station 2")
+
+    results = client.fetch_forecasts(locations, max_concurrency=4)
+
+    assert names(results) == ["Station 0", "Station 1", None, "Station 3"]
+
+
+def test_malformed_payload_is_left_out_of_the_dataframe(make_client, corrupt_forecast):
+    client = make_client()
+    corrupt_forecast(client, "Station 2")
+
+    frame = client.fetch_forecasts_dataframe(build_locations(4), max_concurrency=4)
+
+    assert sorted(frame["location_name"].unique()) == ["Station 0", "Station 1", "Station 3"]
+    assert len(frame) == 3 * 8
+
+
+def test_shared_client_is_not_changed_by_concurrent_batches(server):
+    client    = server.configure(WeatherClient("key", pool_size=4))
+    adapters  = dict(client.session.adapters)
+    locations = build_locations(12)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        batches = list(executor.map(lambda concurrency: client.fetch_forecasts(locations, max_concurrency=concurrency), range(1, 33)))
+
+    assert all(names(results) == [location["name"] for location in locations] for results in batches)
+    assert client.session.adapters == adapters
+    assert client.session.get_adapter(server.base_url)._pool_maxsize == 4
+
+
+def test_from_env_applies_overrides_before_reading_the_environment(environment, tmp_path):
+    environment.setenv("OPENWEATHER_GEOCODING_CACHE", str(tmp_path / "geocoding.sqlite"))
+    environment.setenv("OPENWEATHER_FORECAST_CACHE", str(tmp_path / "forecasts.sqlite"))
+    forecast_cache = ForecastCache(MemoryCacheBackend())
+
+    client = WeatherClient.from_env(api_key="key", geocoding_cache=None, forecast_cache=forecast_cache)
+
+    assert client.api_key == "key"
+    assert client.geocoding_cache is None
+    assert client.forecast_cache is forecast_cache
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_from_env_requires_an_api_key(environment):
+    with pytest.raises(ValueError):
+        WeatherClient.from_env()
+
+
+def test_fetcher_singleton_is_created_once_across_threads(fresh_fetcher, monkeypatch):
+    calls    = []
+    settings = WeatherClient._settings_from_env
+
+    def slow_settings(overrides: dict = None) -> dict:
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return settings(overrides)
+
+    monkeypatch.setattr(WeatherClient, "_settings_from_env", staticmethod(slow_settings))
+    barrier = threading.Barrier(16)
+
+    def create() -> WeatherDataFetcher:
+        barrier.wait()
+        return WeatherDataFetcher()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        instances = [future.result() for future in [executor.submit(create) for _ in range(16)]]
+
+    assert all(instance is instances[0] for instance in instances)
+    assert len(calls) == 1
+
+
+def test_fetcher_from_env_returns_the_singleton(fresh_fetcher):
+    assert WeatherDataFetcher.from_env() is WeatherDataFetcher()
+
+    with pytest.raises(TypeError):
+        WeatherDataFetcher.from_env(api_key="other")
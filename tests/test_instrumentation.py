@@ -0,0 +1,33 @@
+from weather.instrumentation import Instrumentation
+
+
+def samples(text: str, metric: str) -> list[str]:
+    return [line for line in text.splitlines() if line.startswith(metric + "{") or line.startswith(metric + " ")]
+
+
+def test_locations_are_not_recorded_by_default():
+    metrics = Instrumentation()
+
+    for location in ("A", "B", "C"):
+        metrics.record("parse", 1.0, location)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["stages"]["parse"]["count"] == 3
+    assert snapshot["locations"] == {}
+    assert samples(metrics.to_prometheus(), "weather_location_stage_seconds_total") == []
+
+
+def test_per_location_samples_use_a_separate_metric():
+    metrics = Instrumentation(per_location=True)
+    metrics.record("parse", 1.0, "A")
+    metrics.record("parse", 2.0, "B")
+
+    text = metrics.to_prometheus()
+
+    assert samples(text, "weather_stage_seconds_total") == ['weather_stage_seconds_total{stage="parse"} 3.0']
+    assert sorted(samples(text, "weather_location_stage_seconds_total")) == [
+        'weather_location_stage_seconds_total{stage="parse",location="A"} 1.0',
+        'weather_location_stage_seconds_total{stage="parse",location="B"} 2.0'
+    ]
+    assert samples(text, "weather_location_stage_calls_total")
+    assert samples(text, "weather_location_stage_max_seconds")
@@ -0,0 +1,19 @@
+import json
+import os
+
+from benchmarks.generators import build_locations
+from weather.refresh import IncrementalRefresher
+from weather.storage import WeatherStore
+
+
+def test_malformed_payload_does_not_stop_the_refresh(tmp_path, make_client, corrupt_forecast):
+    client = make_client()
+    corrupt_forecast(client, "Station 1")
+    refresher = IncrementalRefresher(client, WeatherStore(str(tmp_path)))
+
+    summary = refresher.refresh(build_locations(3), max_concurrency=3)
+
+    assert summary["Station 1"] is None
+    assert summary["Station 0"]["new"] == summary["Station 2"]["new"] == 8
+    with open(os.path.join(tmp_path, IncrementalRefresher.state_file), encoding="utf-8") as file:
+        assert sorted(json.load(file)) == ["Station 0", "Station 2"]
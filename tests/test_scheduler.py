@@ -0,0 +1,105 @@
+import pytest
+import requests
+
+from weather.scheduler import RateLimitExceeded, RequestScheduler, TokenBucket
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as session:
+        yield session
+
+
+def onecall(server, scheduler, session, api_key="key"):
+    return scheduler.request(session, server.onecall_url, {"lat": 1, "lon": 2, "appid": api_key}, timeout=5)
+
+
+def test_token_bucket_allows_burst_then_rate(clock):
+    bucket = TokenBucket(capacity=3, rate=1, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(1)
+    assert bucket.reserve() == pytest.approx(2)
+
+    clock.sleep(10)
+    assert bucket.reserve() == 0
+    assert bucket.tokens <= bucket.capacity
+
+
+def test_token_bucket_release_returns_token(clock):
+    bucket = TokenBucket(capacity=1, rate=1, clock=clock)
+    bucket.reserve()
+    assert bucket.reserve() == pytest.approx(1)
+
+    bucket.release()
+    bucket.release()
+    assert bucket.tokens == 1
+
+
+def test_requests_are_spread_over_the_quota(server, session, clock):
+    scheduler = RequestScheduler(calls_per_minute=60, sleep=clock.sleep, clock=clock)
+
+    responses = [onecall(server, scheduler, session) for _ in range(65)]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert server.request_count == 65
+    assert clock.now == pytest.approx(5)
+    assert scheduler.stats()["wait_time"] == pytest.approx(5)
+
+
+def test_quota_is_per_api_key(server, session, clock):
+    scheduler = RequestScheduler(calls_per_minute=2, sleep=clock.sleep, clock=clock)
+
+    for api_key in ("a", "a", "b", "b"):
+        onecall(server, scheduler, session, api_key)
+
+    assert clock.sleeps == []
+
+
+def test_retry_after_is_honoured(server, session, clock):
+    scheduler = RequestScheduler(calls_per_minute=None, backoff_base=0.01, sleep=clock.sleep, clock=clock)
+    server.httpd.retry_after = 2
+    server.add_script([429, 429])
+
+    response = onecall(server, scheduler, session)
+
+    assert response.status_code == 200
+    assert server.request_count == 3
+    assert clock.sleeps == [pytest.approx(2), pytest.approx(2)]
+    stats = scheduler.stats()
+    assert (stats["requests"], stats["retries"], stats["throttled"]) == (3, 2, 2)
+
+
+def test_backoff_is_bounded_and_gives_up(server, session, clock):
+    scheduler = RequestScheduler(calls_per_minute=None, max_retries=2, backoff_base=1, backoff_max=1.5, sleep=clock.sleep, clock=clock)
+    server.add_script([503] * 5)
+
+    response = onecall(server, scheduler, session)
+
+    assert response.status_code == 503
+    assert server.request_count == 3
+    assert len(clock.sleeps) == 2
+    assert all(0 <= delay <= 1.5 for delay in clock.sleeps)
+
+
+def test_connection_errors_are_retried_then_raised(session, clock):
+    scheduler = RequestScheduler(calls_per_minute=None, max_retries=2, backoff_base=0.01, sleep=clock.sleep, clock=clock)
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.request(session, "http://127.0.0.1:1/data/3.0/onecall", {"appid": "key"}, timeout=1)
+
+    assert scheduler.stats()["requests"] == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_max_wait_raises_and_releases_the_token(server, session, clock):
+    scheduler = RequestScheduler(calls_per_minute=1, max_wait=5, sleep=clock.sleep, clock=clock)
+    onecall(server, scheduler, session)
+
+    with pytest.raises(RateLimitExceeded):
+        onecall(server, scheduler, session)
+
+    assert server.request_count == 1
+    assert clock.sleeps == []
+    clock.sleep(60)
+    assert onecall(server, scheduler, session).status_code == 200
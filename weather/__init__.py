@@ -1,5 +1,56 @@
-from .helper import WeatherHelper
-from .fetcher import WeatherDataFetcher
-from .plotter import WeatherPlotter
-from .singleton import Singleton
-from .models import LocationWeatherData, TemperatureData, PrecipitationData, WindData
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+# Öffentliche Klassen und das Modul, in dem sie definiert sind.
+# Die Module (und damit pandas, NumPy, matplotlib, seaborn, requests ...) werden erst beim ersten Zugriff geladen,
+# sodass "import weather" schnell bleibt und jedes Skript nur die Abhängigkeiten lädt, die es tatsächlich verwendet.
+_exports = {
+    "WeatherHelper": ".helper",
+    "WeatherDataFetcher": ".fetcher",
+    "WeatherClient": ".fetcher",
+    "CsvWeatherReader": ".csv_reader",
+    "WeatherPlotter": ".plotter",
+    "Singleton": ".singleton",
+    "LocationWeatherData": ".models",
+    "ColumnarLocationWeatherData": ".models",
+    "TemperatureData": ".models",
+    "PrecipitationData": ".models",
+    "WindData": ".models",
+    "ForecastParser": ".parser",
+    "WeatherStore": ".storage",
+    "IncrementalRefresher": ".refresh",
+    "AggregateCube": ".aggregates",
+    "WeatherAnalytics": ".analytics",
+    "Instrumentation": ".instrumentation",
+    "metrics": ".instrumentation",
+    "configure_logging": ".instrumentation"
+}
+
+__all__ = list(_exports)
+
+if TYPE_CHECKING:
+    from .helper import WeatherHelper
+    from .fetcher import WeatherDataFetcher, WeatherClient
+    from .csv_reader import CsvWeatherReader
+    from .plotter import WeatherPlotter
+    from .singleton import Singleton
+    from .models import LocationWeatherData, ColumnarLocationWeatherData, TemperatureData, PrecipitationData, WindData
+    from .parser import ForecastParser
+    from .storage import WeatherStore
+    from .refresh import IncrementalRefresher
+    from .aggregates import AggregateCube
+    from .analytics import WeatherAnalytics
+    from .instrumentation import Instrumentation, metrics, configure_logging
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_exports[name], __name__), name)
+    globals()[name] = value  # Weitere Zugriffe ohne __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+
+from .instrumentation import configure_logging, metrics
+
+
+# Kommandozeile für die Pipeline der Notebooks (ohne Jupyter, z. B. als Cronjob):
+#   python -m weather standorte.csv --output-dir reports      # API: Abrufen -> DataFrames -> Normalisieren -> Plots
+#   python -m weather --csv data/wetterdaten.csv              # CSV: Einlesen -> DataFrames -> Plots
+# matplotlib und seaborn werden erst in der Plot-Phase importiert, sodass Läufe mit --no-plots schnell starten.
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m weather", description="Wetterdaten abrufen, aufbereiten und plotten.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("locations", nargs="?", help="Standortdatei (.csv mit name,state_code,country_code[,lat,lon] oder .json-Liste)")
+    source.add_argument("--csv", dest="csv_file", help="Historische Wetterdaten aus einer CSV-Datei statt der API verwenden")
+
+    parser.add_argument("--concurrency", type=int, default=8, help="Anzahl paralleler API-Anfragen (Standard: 8)")
+    parser.add_argument("--cache-dir", default=".cache", help="Verzeichnis für Geokodierungs- und Antwort-Cache (Standard: .cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Ohne Geokodierungs- und Antwort-Cache abrufen")
+    parser.add_argument("--output-dir", default="reports", help="Zielverzeichnis für Daten und Plots (Standard: reports)")
+    parser.add_argument("--format", choices=("png", "svg"), default="png", help="Dateiformat der Plots")
+    parser.add_argument("--dpi", type=int, default=100, help="Auflösung der Plots")
+    parser.add_argument("--no-plots", action="store_true", help="Nur Daten abrufen und speichern, keine Plots erzeugen")
+    parser.add_argument("--store", help="Daten zusätzlich in einem WeatherStore unter diesem Verzeichnis ablegen")
+    parser.add_argument("--log-level", default="WARNING", choices=("DEBUG", "INFO", "WARNING", "ERROR"), help="Log-Level (Standard: WARNING)")
+    parser.add_argument("--log-json", action="store_true", help="Log-Einträge als JSON-Zeilen ausgeben")
+    parser.add_argument("--metrics-json", help="Kennzahlen des Laufs als JSON in diese Datei schreiben")
+    parser.add_argument("--metrics-prometheus", help="Kennzahlen des Laufs im Textformat von Prometheus in diese Datei schreiben")
+    parser.add_argument("--metrics-per-location", action="store_true", help="Laufzeiten zusätzlich pro Standort erfassen")
+    parser.add_argument("--profile", action="store_true", help="CPU-Profil (profile.pstats) und Speicherspitzen im Ausgabeverzeichnis ablegen")
+    return parser
+
+
+# Liest die Standorte im Format der Notebooks ({"name", "state_code", "country_code"})
+def read_locations(file_path: str) -> list[dict]:
+    if file_path.endswith(".json"):
+        with open(file_path, encoding="utf-8") as file:
+            return json.load(file)
+
+    with open(file_path, newline="", encoding="utf-8") as file:
+        return [
+            {"name": row["name"], "state_code": row.get("state_code") or None, "country_code": row.get("country_code") or None}
+            for row in csv.DictReader(file)
+            if row.get("name")
+        ]
+
+
+# Übersicht der Phasen: zuerst die Phasen der Pipeline, darunter die internen Messungen (HTTP, Parsen, Rendern ...)
+def summary(snapshot: dict) -> str:
+    pipeline = {name[len("pipeline."):]: entry for name, entry in snapshot["stages"].items() if name.startswith("pipeline.")}
+    internal = {name: entry for name, entry in snapshot["stages"].items() if not name.startswith("pipeline.")}
+    width    = max([len(name) + 2 for name in (*pipeline, *internal)] + [len("Total")])
+
+    lines = [f"{name:<{width}}  {entry['seconds']:8.3f} s" for name, entry in pipeline.items()]
+    lines.append(f"{'Total':<{width}}  {sum(entry['seconds'] for entry in pipeline.values()):8.3f} s")
+    if internal:
+        lines.append("")
+        lines += [
+            f"  {name:<{width - 2}}  {entry['seconds']:8.3f} s  {entry['count']:>6}x  max {entry['max_seconds'] * 1e3:8.1f} ms"
+            for name, entry in internal.items()
+        ]
+    return "\n".join(lines)
+
+
+# Caches des CLI-Laufs unter --cache-dir (bzw. keine mit --no-cache); sie werden dem eigenen Client des Laufs
+# übergeben, damit die über Umgebungsvariablen konfigurierten Caches gar nicht erst geöffnet werden
+def build_caches(args) -> dict:
+    from .cache import DiskCacheBackend, ForecastCache, GeocodingCache
+
+    if args.no_cache:
+        return {"geocoding_cache": None, "forecast_cache": None}
+
+    max_age         = float(os.getenv("OPENWEATHER_FORECAST_MAX_AGE", 600))
+    geocoding_cache = GeocodingCache(os.path.join(args.cache_dir, "geocoding.sqlite"))
+    forecast_cache  = ForecastCache(DiskCacheBackend(os.path.join(args.cache_dir, "forecasts.sqlite"), ttl=max_age), max_age=max_age)
+
+    # Standortdateien mit Koordinaten füllen den Geokodierungs-Cache vorab
+    if args.locations and args.locations.endswith(".csv"):
+        with open(args.locations, newline="", encoding="utf-8") as file:
+            has_coordinates = {"lat", "lon"} <= set(csv.DictReader(file).fieldnames or [])
+        if has_coordinates:
+            geocoding_cache.preload_from_csv(args.locations)
+
+    return {"geocoding_cache": geocoding_cache, "forecast_cache": forecast_cache}
+
+
+def close_caches(geocoding_cache, forecast_cache):
+    if geocoding_cache is not None:
+        geocoding_cache.close()
+    if forecast_cache is not None:
+        forecast_cache.backend.close()
+
+
+# Die Caches bleiben bis nach dem Schreiben der Kennzahlen geöffnet (resources schliesst sie am Ende von main)
+def run_api(args, resources: contextlib.ExitStack) -> dict:
+    from dotenv import load_dotenv
+
+    from .fetcher import WeatherClient
+    from .helper import WeatherHelper
+
+    with metrics.stage("pipeline.Setup"):
+        load_dotenv()  # OPENWEATHER_FORECAST_MAX_AGE kann auch aus der .env-Datei stammen
+        locations = read_locations(args.locations)
+        caches    = build_caches(args)
+        resources.callback(close_caches, **caches)
+        client    = WeatherClient.from_env(**caches)
+        helper    = WeatherHelper()
+        client.register_metrics()
+
+    with metrics.stage("pipeline.Fetch"):
+        results = client.fetch_forecasts(locations, max_concurrency=args.concurrency)
+
+    with metrics.stage("pipeline.DataFrames"):
+        fetched    = [(location["name"], result) for location, result in zip(locations, results) if result is not None]
+        dataframes = [helper.create_dataframe(result) for _, result in fetched]
+
+    with metrics.stage("pipeline.Normalize"):
+        normalized    = helper.normalize_dataframes_on_date(dataframes)
+        location_data = {name: df for (name, _), df in zip(fetched, normalized)}
+
+    failed = [location["name"] for location, result in zip(locations, results) if result is None]
+    if failed:
+        print(f"Für {len(failed)} von {len(locations)} Standorten konnten keine Daten abgerufen werden: {', '.join(failed)}", file=sys.stderr)
+    return location_data
+
+
+# CSV-Modus ohne API-Client: braucht keinen API-Schlüssel und keinen Netzwerkzugriff
+def run_csv(args) -> dict:
+    from .csv_reader import CsvWeatherReader
+    from .helper import WeatherHelper
+
+    with metrics.stage("pipeline.Setup"):
+        reader = CsvWeatherReader()
+        helper = WeatherHelper()
+
+    with metrics.stage("pipeline.Read CSV"):
+        instances = reader.get_weather_data_from_csv(args.csv_file) or []
+
+    with metrics.stage("pipeline.DataFrames"):
+        return {instance.location_name: helper.create_dataframe(instance) for instance in instances}
+
+
+def save_data(location_data: dict, args):
+    import pandas as pd
+
+    with metrics.stage("pipeline.Save data"):
+        os.makedirs(args.output_dir, exist_ok=True)
+        combined = pd.concat([df.assign(location=name) for name, df in location_data.items()], ignore_index=True)
+        combined = combined[["location", *[column for column in combined.columns if column != "location"]]]
+        combined.to_csv(os.path.join(args.output_dir, "weather_data.csv"), index=False)
+
+        if args.store:
+            from .storage import WeatherStore
+            WeatherStore(args.store).write_many(location_data)
+
+
+def plot(location_data: dict, args) -> list[str]:
+    with metrics.stage("pipeline.Plot"):
+        from .plotter import WeatherPlotter
+
+        # Gleiche Plots wie in den Notebooks; die CSV-Daten erhalten die Monatsnamen als Beschriftung
+        plots = WeatherPlotter.default_plots(location_data)
+        if args.csv_file:
+            months = ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli", "August", "September", "Oktober", "November", "Dezember"]
+            if all(len(df) == len(months) for df in location_data.values()):
+                plots = [(name, {"xlabels": months} if name == "plot_min_max_temperatures" else kwargs) for name, kwargs in plots]
+
+        return WeatherPlotter.export_batch({"": location_data}, args.output_dir, plots, args.format, args.dpi, max_workers=1)
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level, args.log_json)
+
+    if args.concurrency < 1:
+        print("--concurrency muss mindestens 1 sein.", file=sys.stderr)
+        return 2
+
+    metrics.per_location = args.metrics_per_location
+    with contextlib.ExitStack() as resources:
+        if args.profile:
+            with metrics.profile() as capture:
+                status = run(args, resources)
+
+            profile_path = os.path.join(args.output_dir, "profile.pstats")
+            os.makedirs(args.output_dir, exist_ok=True)
+            capture["profiler"].dump_stats(profile_path)
+            print(f"Speicherspitze: {capture['memory']['peak_bytes'] / 2 ** 20:.1f} MiB, CPU-Profil: {profile_path}")
+        else:
+            status = run(args, resources)
+
+        write_metrics(args)
+    return status
+
+
+def run(args, resources: contextlib.ExitStack) -> int:
+    try:
+        location_data = run_csv(args) if args.csv_file else run_api(args, resources)
+    except (OSError, ValueError) as e:
+        print(f"Ein Fehler ist aufgetreten: {e}", file=sys.stderr)
+        return 1
+
+    if not location_data:
+        print("Keine Wetterdaten vorhanden.", file=sys.stderr)
+        return 1
+
+    save_data(location_data, args)
+    files = [] if args.no_plots else plot(location_data, args)
+
+    print(f"{len(location_data)} Standorte, {len(files)} Plots in {args.output_dir}")
+    print(summary(metrics.snapshot()))
+    return 0
+
+
+# Schreibt die Kennzahlen des Laufs (inklusive Profil) in die angegebenen Dateien
+def write_metrics(args):
+    if args.metrics_json:
+        with open(args.metrics_json, "w", encoding="utf-8") as file:
+            file.write(metrics.to_json())
+    if args.metrics_prometheus:
+        with open(args.metrics_prometheus, "w", encoding="utf-8") as file:
+            file.write(metrics.to_prometheus())
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .parser import ForecastParser
+
+
+# Vorberechnete Aggregate pro Standort für Heatmaps, Summen und Übersichtstabellen.
+# Pro Standort und (Jahr, Monat) bzw. (Standort, Tag im Jahr) werden für jede Messgrösse Summe, Anzahl, Minimum und
+# Maximum gehalten. Diese Werte lassen sich zusammenführen, sodass neue Tage mit add() eingerechnet werden, ohne die
+# bisherigen Rohdaten erneut zu lesen; Mittelwerte ergeben sich erst beim Abfragen aus Summe / Anzahl.
+# Mit measures werden nur die angegebenen Messgrössen eingerechnet, mit daily=False keine Werte pro Tag im Jahr
+# (z. B. für einen einzelnen Plot, der nur Monatswerte einer Messgrösse braucht).
+class AggregateCube:
+    measures   = ("temp_morning", "temp_day", "temp_evening", "temp_night", "temp_min", "temp_max", "temp_avg", "rain", "snow", "wind_speed")
+    statistics = ("sum", "count", "min", "max")
+
+    def __init__(self, measures: tuple[str, ...] = None, daily: bool = True):
+        if measures is not None:
+            self.measures = tuple(measures)
+        self.daily    = daily
+        self._monthly = None  # Index (location, year, month), Spalten (Messgrösse, Kennzahl)
+        self._daily   = None  # Index (location, day_of_year), Spalten (Messgrösse, Kennzahl)
+        self._dates   = {}    # Standort -> sortierte, bereits eingerechnete Tage (datetime64[D])
+        self._lock    = threading.Lock()
+
+    # Baut den Würfel aus location_data ({Standortname: DataFrame}) auf
+    @classmethod
+    def from_location_data(cls, location_data: dict[str, pd.DataFrame], measures: tuple[str, ...] = None, daily: bool = True) -> "AggregateCube":
+        cube = cls(measures, daily)
+        cube.update(location_data)
+        return cube
+
+    # Baut den Würfel aus einem WeatherStore auf (optional nur für die angegebenen Standorte)
+    @classmethod
+    def from_store(cls, store, locations: list[str] = None) -> "AggregateCube":
+        return cls.from_location_data(store.read_locations(locations))
+
+    # Rechnet mehrere Standorte ein und gibt pro Standort die Anzahl neu übernommener Tage zurück.
+    # Bereits enthaltene Tage werden übersprungen; korrigierte Werte werden mit replace() übernommen.
+    def update(self, location_data: dict[str, pd.DataFrame]) -> dict[str, int]:
+        with self._lock:
+            counts   = dict.fromkeys(location_data, 0)
+            frames   = {name: df for name, df in location_data.items() if not df.empty and any(measure in df.columns for measure in self.measures)}
+            measures = [measure for measure in self.measures if any(measure in df.columns for df in frames.values())]
+            if not frames:
+                return counts
+
+            # Datumswerte aller Standorte in einem Aufruf umwandeln (API-Daten wiederholen dieselben Zeichenketten)
+            all_days = self._to_days(pd.concat([df["date"] for df in frames.values()], ignore_index=True))
+            all_days = np.split(all_days, np.cumsum([len(df) for df in frames.values()])[:-1])
+
+            columns, locations, days = {measure: [] for measure in measures}, [], []
+            for (location_name, df), location_days in zip(frames.items(), all_days):
+                is_new = ~np.isnat(location_days)
+                known  = self._dates.get(location_name)
+                if known is not None:
+                    is_new &= ~np.isin(location_days, known)
+                if not is_new.any():
+                    continue
+
+                location_days = location_days[is_new]
+                for measure in measures:
+                    columns[measure].append(df[measure].to_numpy()[is_new] if measure in df.columns else np.full(len(location_days), np.nan))
+                locations.append(np.full(len(location_days), location_name, dtype=object))
+                days.append(location_days)
+                counts[location_name] = len(location_days)
+                self._dates[location_name] = np.unique(location_days) if known is None else np.union1d(known, location_days)
+
+            if not days:
+                return counts
+
+            # Alle neuen Tage in einem Durchlauf aggregieren und mit den bestehenden Zellen zusammenführen
+            values    = pd.DataFrame({measure: np.concatenate(parts) for measure, parts in columns.items()})
+            locations = np.concatenate(locations)
+            dates     = pd.DatetimeIndex(np.concatenate(days))
+
+            self._monthly = self._merge(self._monthly, self._aggregate(values, {"location": locations, "year": dates.year, "month": dates.month}))
+            if self.daily:
+                self._daily = self._merge(self._daily, self._aggregate(values, {"location": locations, "day_of_year": dates.dayofyear}))
+            return counts
+
+    # Rechnet die noch nicht enthaltenen Tage eines Standorts ein und gibt deren Anzahl zurück
+    def add(self, location_name: str, df: pd.DataFrame) -> int:
+        return self.update({location_name: df})[location_name]
+
+    # Ersetzt alle Aggregate eines Standorts durch die aus df berechneten (z. B. nach geänderten Vorhersagen)
+    def replace(self, location_name: str, df: pd.DataFrame) -> int:
+        self.remove(location_name)
+        return self.add(location_name, df)
+
+    def remove(self, location_name: str):
+        with self._lock:
+            self._monthly = self._drop(self._monthly, location_name)
+            self._daily   = self._drop(self._daily, location_name)
+            self._dates.pop(location_name, None)
+
+    # Gibt die Namen aller enthaltenen Standorte in der Reihenfolge des Einrechnens zurück
+    def locations(self) -> list[str]:
+        return list(self._dates)
+
+    # Monatswerte einer Messgrösse: Zeilen (location, year), Spalten Monat 1-12.
+    # stat ist "mean", "sum", "count", "min" oder "max".
+    def monthly(self, measure: str = "temp_avg", stat: str = "mean", locations: list[str] = None) -> pd.DataFrame:
+        values = self._select(self._monthly, measure, stat, locations)
+        return values.unstack("month").sort_index(axis=1)
+
+    # Werte einer Messgrösse pro Tag im Jahr (1-366) über alle Jahre: Zeilen Tag im Jahr, Spalten Standorte
+    def day_of_year(self, measure: str = "temp_avg", stat: str = "mean", locations: list[str] = None) -> pd.DataFrame:
+        values = self._select(self._daily, measure, stat, locations)
+        return values.unstack("location").reindex(columns=self._ordered(locations))
+
+    # Gesamtwert einer Messgrösse pro Standort (Standard: Summe, z. B. für Niederschlag)
+    def totals(self, measure: str, stat: str = "sum", locations: list[str] = None) -> pd.Series:
+        monthly = self._cells(self._monthly, measure, locations)
+        grouped = monthly.groupby(level="location", sort=False)
+        totals  = self._statistic(grouped.agg({"sum": "sum", "count": "sum", "min": "min", "max": "max"}), stat)
+        return totals.reindex(self._ordered(locations)).rename(measure)
+
+    # Übersicht pro Standort: Anzahl Tage, Durchschnitts-, Tiefst- und Höchsttemperatur, Niederschlag und Wind
+    def summary(self, locations: list[str] = None) -> pd.DataFrame:
+        columns = {
+            "days": ("temp_avg", "count"),
+            "temp_avg": ("temp_avg", "mean"),
+            "temp_min": ("temp_min", "min"),
+            "temp_max": ("temp_max", "max"),
+            "rain": ("rain", "sum"),
+            "snow": ("snow", "sum"),
+            "wind_speed": ("wind_speed", "mean")
+        }
+        available = self._monthly.columns.get_level_values(0) if self._monthly is not None else []
+        return pd.DataFrame({
+            name: self.totals(measure, stat, locations)
+            for name, (measure, stat) in columns.items()
+            if measure in available
+        })
+
+    def __len__(self):
+        return len(self._dates)
+
+    def __contains__(self, location_name: str):
+        return location_name in self._dates
+
+    def __repr__(self):
+        days = sum(len(dates) for dates in self._dates.values())
+        return f"AggregateCube(locations={len(self._dates)}, days={days})"
+
+    # Datumsspalte als Tage (datetime64[D])
+    def _to_days(self, dates: pd.Series) -> np.ndarray:
+        return ForecastParser.to_datetime(dates).to_numpy().astype("datetime64[D]")
+
+    @classmethod
+    def _aggregate(cls, values: pd.DataFrame, keys: dict) -> pd.DataFrame:
+        grouped = values.groupby([np.asarray(key) for key in keys.values()], sort=False)
+        cells   = pd.concat({stat: getattr(grouped, stat)() for stat in cls.statistics}, axis=1)
+        cells.columns     = cells.columns.swaplevel()
+        cells.index.names = list(keys)
+        return cells[pd.MultiIndex.from_product([values.columns, cls.statistics])]
+
+    # Führt bestehende und neue Zellen zusammen (Summen und Anzahlen addieren, Extremwerte vergleichen)
+    @staticmethod
+    def _merge(existing: pd.DataFrame | None, cells: pd.DataFrame) -> pd.DataFrame:
+        if existing is None:
+            return cells
+
+        combined = pd.concat([existing, cells])
+        if not combined.index.has_duplicates:
+            return combined
+
+        functions = {column: "sum" if column[1] in ("sum", "count") else column[1] for column in combined.columns}
+        return combined.groupby(level=list(range(combined.index.nlevels)), sort=False).agg(functions)
+
+    @staticmethod
+    def _drop(cells: pd.DataFrame | None, location_name: str) -> pd.DataFrame | None:
+        if cells is None:
+            return None
+        cells = cells[cells.index.get_level_values("location") != location_name]
+        return cells if not cells.empty else None
+
+    def _cells(self, cells: pd.DataFrame | None, measure: str, locations: list[str] = None) -> pd.DataFrame:
+        if cells is None or measure not in cells.columns.get_level_values(0):
+            raise KeyError(f"Für '{measure}' sind keine Aggregate vorhanden.")
+
+        cells = cells[measure]
+        if locations is not None:
+            cells = cells[cells.index.get_level_values("location").isin(list(locations))]
+        return cells
+
+    def _select(self, cells: pd.DataFrame | None, measure: str, stat: str, locations: list[str] = None) -> pd.Series:
+        return self._statistic(self._cells(cells, measure, locations), stat)
+
+    @staticmethod
+    def _statistic(cells: pd.DataFrame, stat: str) -> pd.Series:
+        if stat == "mean":
+            return cells["sum"] / cells["count"].where(cells["count"] > 0)
+        if stat not in cells.columns:
+            raise ValueError(f"Unbekannte Kennzahl '{stat}'. Erlaubt sind: mean, {', '.join(cells.columns)}.")
+        return cells[stat]
+
+    def _ordered(self, locations: list[str] = None) -> list[str]:
+        return [location for location in self._dates if locations is None or location in locations]
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from .parser import ForecastParser
+
+
+# Klimastatistiken für beliebig viele Standorte auf einmal.
+# Eingabe ist location_data ({Standortname: DataFrame} aus create_dataframe bzw. get_weather_data_from_csv) oder ein
+# langes DataFrame mit den Spalten "location" und "date" (z. B. aus WeatherStore.read). Alle Standorte werden einmal in
+# ein langes, nach Standort und Datum sortiertes DataFrame überführt (siehe prepare); die Kennzahlen werden darauf mit
+# gruppierten NumPy/pandas-Operationen berechnet, ohne Python-Schleife pro Standort.
+# Ergebnisse sind lange DataFrames mit der Spalte "location" (kategorisch) und, je nach Kennzahl, "date" oder der Periode.
+class WeatherAnalytics:
+    periods = {"year": "Y", "month": "M", "season": "Q-NOV"}
+
+    # Überführt die Standortdaten in ein langes DataFrame (location, date, Messgrössen), sortiert nach Standort und Datum.
+    # Das Ergebnis kann an alle übrigen Methoden übergeben werden, um die Umwandlung nur einmal durchzuführen.
+    def prepare(self, location_data: dict[str, pd.DataFrame] | pd.DataFrame, columns: list[str] = None) -> pd.DataFrame:
+        if isinstance(location_data, pd.DataFrame):
+            df = location_data if columns is None else location_data[["location", "date", *columns]]
+            return self._sorted(df.assign(
+                location=df["location"].astype("category"),
+                date=ForecastParser.to_datetime(df["date"])
+            ))
+
+        names   = list(location_data)
+        frames  = list(location_data.values())
+        columns = columns if columns is not None else self._common_columns(frames)
+        lengths = np.array([len(df) for df in frames])
+
+        # Spalten direkt als NumPy-Arrays aneinanderhängen (kein concat von DataFrames)
+        data = {
+            "location": pd.Categorical.from_codes(np.repeat(np.arange(len(names)), lengths), categories=pd.Index(names, dtype=object)),
+            "date": np.concatenate([ForecastParser.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]") for df in frames]) if frames else np.array([], dtype="datetime64[ns]")
+        }
+        for column in columns:
+            data[column] = np.concatenate([df[column].to_numpy(dtype=float) for df in frames]) if frames else np.array([], dtype=float)
+
+        return self._sorted(pd.DataFrame(data))
+
+    # Mittelwert jeder Messgrösse pro Standort und Monat (bzw. Tag im Jahr) über die Referenzperiode
+    # (base_period = (erstes Jahr, letztes Jahr), ohne Angabe alle Jahre). Zeilen (location, month | day_of_year).
+    def climatology(self, location_data, column: str = "temp_avg", by: str = "month", base_period: tuple[int, int] = None) -> pd.Series:
+        df   = self.prepare(location_data, [column])
+        keys = self._calendar_key(df["date"], by)
+        base = self._in_period(df["date"], base_period)
+        return df[column][base].groupby([df["location"][base], keys[base]], observed=True).mean().rename_axis(["location", by])
+
+    # Abweichung jedes Werts vom Klimamittel desselben Standorts und Monats (bzw. Tags im Jahr)
+    def anomalies(self, location_data, column: str = "temp_avg", by: str = "month", base_period: tuple[int, int] = None) -> pd.DataFrame:
+        df   = self.prepare(location_data, [column])
+        keys = self._calendar_key(df["date"], by)
+        base = self._in_period(df["date"], base_period)
+
+        # Klimamittel als Tabelle (Standort × Monat) und per Index-Zugriff jedem Wert zuordnen
+        codes   = df["location"].cat.codes.to_numpy().astype(np.int64)
+        size    = 13 if by == "month" else 367
+        values  = df[column].to_numpy(dtype=float)
+        valid   = base & ~np.isnan(values)
+        flat    = codes * size + keys
+        sums    = np.bincount(flat[valid], weights=values[valid], minlength=len(df["location"].cat.categories) * size)
+        counts  = np.bincount(flat[valid], minlength=len(sums))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            normals = (sums / counts)[flat]
+
+        return pd.DataFrame({
+            "location": df["location"],
+            "date": df["date"],
+            column: values,
+            "climatology": normals,
+            "anomaly": values - normals
+        })
+
+    # Gleitender Mittelwert über window Zeilen (bei Tagesdaten: Tage) je Standort.
+    # min_periods: Mindestanzahl gültiger Werte im Fenster (Standard: window), sonst NaN.
+    def rolling_mean(self, location_data, column: str = "temp_avg", window: int = 30, min_periods: int = None) -> pd.DataFrame:
+        df          = self.prepare(location_data, [column])
+        min_periods = window if min_periods is None else min_periods
+        values      = df[column].to_numpy(dtype=float)
+        valid       = ~np.isnan(values)
+
+        # Kumulierte Summen über alle Standorte; das Fenster wird am Beginn jedes Standorts abgeschnitten
+        sums   = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+        counts = np.concatenate([[0], np.cumsum(valid)])
+        end    = np.arange(1, len(values) + 1)
+        start  = np.maximum(end - window, self._group_starts(df["location"]))
+
+        window_sums   = sums[end] - sums[start]
+        window_counts = counts[end] - counts[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(window_counts >= min_periods, window_sums / window_counts, np.nan)
+
+        return pd.DataFrame({
+            "location": df["location"],
+            "date": df["date"],
+            column: values,
+            f"{column}_rolling_{window}": means
+        })
+
+    # Perzentile einer Messgrösse pro Standort (optional zusätzlich pro Periode "year", "month" oder "season")
+    def percentiles(self, location_data, column: str = "temp_avg", q: tuple[float, ...] = (0.1, 0.5, 0.9), by: str = None) -> pd.DataFrame:
+        df   = self.prepare(location_data, [column])
+        keys = [df["location"]] if by is None else [df["location"], self._period(df["date"], by)]
+
+        result = df[column].groupby(keys, observed=True).quantile(list(q)).unstack()
+        result.columns = [f"p{value * 100:g}" for value in q]
+        return result.rename_axis(["location"] if by is None else ["location", by])
+
+    # Heiz- (kind="heating": base - T) bzw. Kühlgradtage (kind="cooling": T - base) pro Standort und Periode.
+    # Negative Differenzen zählen als 0. freq ist "year", "month", "season" oder None (gesamter Zeitraum).
+    def degree_days(self, location_data, base: float = 18.0, kind: str = "heating", freq: str = "year", column: str = "temp_avg") -> pd.Series:
+        if kind not in ("heating", "cooling"):
+            raise ValueError("kind muss 'heating' oder 'cooling' sein.")
+
+        df         = self.prepare(location_data, [column])
+        difference = base - df[column] if kind == "heating" else df[column] - base
+        degrees    = difference.clip(lower=0)
+
+        keys = [df["location"]] if freq is None else [df["location"], self._period(df["date"], freq)]
+        return degrees.groupby(keys, observed=True).sum(min_count=1).rename(f"{kind}_degree_days")
+
+    # Zählt Extremereignisse pro Standort und Periode: Tage über (above=True) bzw. unter threshold sowie Ereignisse
+    # aus mindestens min_duration aufeinanderfolgenden solchen Tagen (z. B. Hitzewellen). Ein Ereignis zählt in der
+    # Periode, in der es beginnt. Tage mit fehlendem Wert unterbrechen ein Ereignis.
+    def extreme_events(self, location_data, column: str = "temp_max", threshold: float = 30.0, above: bool = True, min_duration: int = 1, freq: str = "year") -> pd.DataFrame:
+        df     = self.prepare(location_data, [column])
+        values = df[column].to_numpy(dtype=float)
+        with np.errstate(invalid="ignore"):
+            flags = values > threshold if above else values < threshold
+
+        # Ein Ereignis beginnt an einem markierten Tag, dessen Vortag (desselben Standorts) nicht markiert ist
+        # oder mehr als einen Tag zurückliegt
+        dates    = df["date"].to_numpy(dtype="datetime64[D]")
+        previous = np.r_[False, flags[:-1]] & ~self._group_boundaries(df["location"]) & (np.diff(dates, prepend=dates[:1]) == np.timedelta64(1, "D"))
+        starts   = flags & ~previous
+
+        event_ids = np.cumsum(starts) - 1
+        lengths   = np.bincount(event_ids[flags], minlength=int(starts.sum())) if flags.any() else np.zeros(0, dtype=int)
+        events    = starts.copy()
+        events[starts] = lengths >= min_duration
+
+        keys   = [df["location"]] if freq is None else [df["location"], self._period(df["date"], freq)]
+        counts = pd.DataFrame({"days": flags, "events": events}).groupby(keys, observed=True).sum()
+        return counts.astype(int)
+
+    # Kennzahlen (z. B. mean, min, max, std, sum) mehrerer Messgrössen pro Standort und Periode
+    def grouped(self, location_data, columns: list[str] = None, freq: str = "year", stats: tuple[str, ...] = ("mean", "min", "max")) -> pd.DataFrame:
+        df      = self.prepare(location_data, columns)
+        columns = columns if columns is not None else [column for column in df.columns if column not in ("location", "date")]
+        keys    = [df["location"]] if freq is None else [df["location"], self._period(df["date"], freq)]
+        return df[columns].groupby(keys, observed=True).agg(list(stats))
+
+    @staticmethod
+    def _common_columns(frames: list[pd.DataFrame]) -> list[str]:
+        if not frames:
+            return []
+        columns = [column for column in frames[0].columns if column != "date" and pd.api.types.is_numeric_dtype(frames[0][column])]
+        return [column for column in columns if all(column in df.columns for df in frames[1:])]
+
+    @staticmethod
+    def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+        codes = df["location"].cat.codes.to_numpy()
+        dates = df["date"].to_numpy()
+        if len(df) > 1 and not (np.all(codes[1:] >= codes[:-1]) and np.all((codes[1:] != codes[:-1]) | (dates[1:] >= dates[:-1]))):
+            df = df.iloc[np.lexsort((dates, codes))]
+        return df.reset_index(drop=True)
+
+    # Markiert die erste Zeile jedes Standorts (Daten sind nach Standort sortiert)
+    @staticmethod
+    def _group_boundaries(locations: pd.Series) -> np.ndarray:
+        codes = locations.cat.codes.to_numpy()
+        return np.r_[True, codes[1:] != codes[:-1]] if len(codes) else np.zeros(0, dtype=bool)
+
+    # Index der ersten Zeile des jeweiligen Standorts für jede Zeile
+    def _group_starts(self, locations: pd.Series) -> np.ndarray:
+        boundaries = self._group_boundaries(locations)
+        return np.maximum.accumulate(np.where(boundaries, np.arange(len(boundaries)), 0))
+
+    @staticmethod
+    def _calendar_key(dates: pd.Series, by: str) -> np.ndarray:
+        if by == "month":
+            return dates.dt.month.to_numpy()
+        if by == "day_of_year":
+            return dates.dt.dayofyear.to_numpy()
+        raise ValueError("by muss 'month' oder 'day_of_year' sein.")
+
+    @staticmethod
+    def _in_period(dates: pd.Series, period: tuple[int, int] | None) -> np.ndarray:
+        if period is None:
+            return np.ones(len(dates), dtype=bool)
+        years = dates.dt.year.to_numpy()
+        return (years >= period[0]) & (years <= period[1])
+
+    # Periode als Schlüssel: Jahr (int), Monat bzw. meteorologische Jahreszeit (Dez-Feb, Mär-Mai, ...) als Period
+    def _period(self, dates: pd.Series, freq: str) -> pd.Series:
+        if freq not in self.periods:
+            raise ValueError(f"Unbekannte Periode '{freq}'. Erlaubt sind: {', '.join(self.periods)}.")
+        if freq == "year":
+            return dates.dt.year.rename("year")
+        return dates.dt.to_period(self.periods[freq]).rename(freq)
@@ -0,0 +1,396 @@
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+# Persistenter Cache für Geokodierungs-Ergebnisse (SQLite, eine Datei).
+# Schlüssel ist die normalisierte Abfrage (Stadt, Bundesland, Land); Einträge verfallen nach ttl Sekunden,
+# bei mehr als max_entries Einträgen werden die am längsten nicht verwendeten entfernt (LRU).
+# Treffer schreiben nichts in die Datenbank: die Zugriffszeiten werden im Speicher gesammelt und gebündelt
+# geschrieben (vor dem Entfernen alter Einträge in set_many, bei close und spätestens nach access_flush_size Treffern).
+class GeocodingCache:
+    access_flush_size = 1000
+
+    def __init__(self, path: str = ".cache/geocoding.sqlite", ttl: float | None = 30 * 24 * 3600, max_entries: int | None = 100_000):
+        self.path        = path
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self._lock       = threading.Lock()
+        self._accessed   = {}  # Abfrage -> letzte Zugriffszeit, noch nicht in der Datenbank
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # WAL: Lesen blockiert nicht beim Schreiben; NORMAL: kein fsync pro Commit (ein Cache darf Einträge verlieren)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS geocoding ("
+            " query TEXT PRIMARY KEY,"
+            " coordinates TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS geocoding_last_access ON geocoding (last_access)")
+        self._connection.commit()
+
+    # Normalisiert die Abfrage, damit z. B. "Zürich, ZH" und "zürich,zh" denselben Eintrag treffen
+    @staticmethod
+    def make_key(city_name: str, state_code: str = None, country_code: str = None) -> str:
+        parts = [city_name, state_code, country_code]
+        return ",".join(" ".join(str(part).split()).casefold() if part else "" for part in parts)
+
+    # Liefert die gespeicherten Koordinaten oder None, wenn kein gültiger Eintrag existiert
+    def get(self, city_name: str, state_code: str = None, country_code: str = None) -> tuple[float, float] | list[tuple[float, float]] | None:
+        key = self.make_key(city_name, state_code, country_code)
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute("SELECT coordinates, created_at FROM geocoding WHERE query = ?", (key,)).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                if row is not None:
+                    self._accessed.pop(key, None)
+                    self._connection.execute("DELETE FROM geocoding WHERE query = ?", (key,))
+                    self._connection.commit()
+                self.misses += 1
+                return None
+
+            self._accessed[key] = now
+            if len(self._accessed) >= self.access_flush_size:
+                self._flush_access()
+                self._connection.commit()
+            self.hits += 1
+
+        return self._decode(row[0])
+
+    # Speichert Koordinaten für eine Abfrage und entfernt bei Bedarf die ältesten Einträge
+    def set(self, city_name: str, state_code: str = None, country_code: str = None, coordinates: tuple[float, float] | list[tuple[float, float]] = None):
+        self.set_many([((city_name, state_code, country_code), coordinates)])
+
+    def set_many(self, entries: list[tuple[tuple[str, str, str], tuple[float, float] | list[tuple[float, float]]]]):
+        now  = time.time()
+        rows = [(self.make_key(*query), json.dumps(coordinates), now, now) for query, coordinates in entries]
+
+        with self._lock:
+            self._flush_access()
+            self._connection.executemany("INSERT OR REPLACE INTO geocoding VALUES (?, ?, ?, ?)", rows)
+            self._evict()
+            self._connection.commit()
+
+    # Befüllt den Cache aus einer CSV-Datei mit den Spalten name, state_code, country_code, lat, lon
+    def preload_from_csv(self, file_path: str) -> int:
+        entries = []
+        with open(file_path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                if not row.get("lat") or not row.get("lon"):
+                    continue
+                query = (row["name"], row.get("state_code") or None, row.get("country_code") or None)
+                entries.append((query, (float(row["lat"]), float(row["lon"]))))
+
+        self.set_many(entries)
+        return len(entries)
+
+    # Gibt Trefferzahlen und die aktuelle Grösse des Caches zurück
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self)
+        }
+
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._connection.execute("DELETE FROM geocoding")
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._flush_access()
+            self._connection.commit()
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM geocoding").fetchone()[0]
+
+    # Schreibt die gesammelten Zugriffszeiten (ohne Commit; wird unter _lock aufgerufen)
+    def _flush_access(self):
+        if self._accessed:
+            self._connection.executemany(
+                "UPDATE geocoding SET last_access = ? WHERE query = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    # Entfernt abgelaufene Einträge und, falls nötig, die am längsten nicht verwendeten
+    def _evict(self):
+        if self.ttl is not None:
+            self._connection.execute("DELETE FROM geocoding WHERE created_at < ?", (time.time() - self.ttl,))
+        if self.max_entries is not None:
+            self._connection.execute(
+                "DELETE FROM geocoding WHERE query IN ("
+                " SELECT query FROM geocoding ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    # JSON kennt keine Tupel: Koordinaten wieder in das Rückgabeformat des Fetchers umwandeln
+    @staticmethod
+    def _decode(value: str) -> tuple[float, float] | list[tuple[float, float]]:
+        coordinates = json.loads(value)
+        if coordinates and isinstance(coordinates[0], list):
+            return [tuple(pair) for pair in coordinates]
+        return tuple(coordinates)
+
+
+# In-Memory-Backend für den ForecastCache (pro Prozess, LRU-begrenzt)
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int | None = 10_000):
+        self.max_entries = max_entries
+        self._entries    = OrderedDict()
+        self._lock       = threading.Lock()
+
+    def get(self, key: str) -> tuple[bytes, float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, payload: bytes, stored_at: float):
+        with self._lock:
+            self._entries[key] = (payload, stored_at)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Festplatten-Backend für den ForecastCache (SQLite, überlebt Neustarts und Notebook-Kernel).
+# Einträge, die älter als ttl Sekunden sind, werden entfernt; bei mehr als max_entries Einträgen die ältesten.
+# Aufgeräumt wird beim Öffnen und nach jeweils evict_interval geschriebenen Antworten (die Grenze kann also
+# kurzzeitig um bis zu evict_interval Einträge überschritten werden).
+class DiskCacheBackend:
+    evict_interval = 100
+
+    def __init__(self, path: str = ".cache/forecasts.sqlite", ttl: float | None = 24 * 3600, max_entries: int | None = 100_000):
+        self.path        = path
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self._writes     = 0
+        self._lock       = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # WAL: Lesen blockiert nicht beim Schreiben; NORMAL: kein fsync pro Commit (ein Cache darf Einträge verlieren)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " stored_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        self._evict()
+        self._connection.commit()
+
+    def get(self, key: str) -> tuple[bytes, float] | None:
+        with self._lock:
+            row = self._connection.execute("SELECT payload, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+        return (bytes(row[0]), row[1]) if row is not None else None
+
+    def set(self, key: str, payload: bytes, stored_at: float):
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, payload, stored_at))
+            self._writes += 1
+            if self._writes % self.evict_interval == 0:
+                self._evict()
+            self._connection.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    # Entfernt abgelaufene Einträge und, falls nötig, die ältesten (ohne Commit; wird unter _lock aufgerufen)
+    def _evict(self):
+        if self.ttl is not None:
+            self._connection.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+        if self.max_entries is not None:
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+
+# Antwort-Cache für One Call Anfragen.
+# Schlüssel sind die auf precision Nachkommastellen gerundeten Koordinaten plus die übrigen Parameter (ohne API-Schlüssel).
+# Antworten gelten max_age Sekunden als frisch; innerhalb weiterer stale_while_revalidate Sekunden wird die alte
+# Antwort sofort zurückgegeben und im Hintergrund aktualisiert.
+# Fragen mehrere Threads gleichzeitig einen fehlenden Schlüssel an, lädt nur der erste; die übrigen warten auf
+# dessen Ergebnis (bzw. Fehler) und werden als "coalesced" gezählt.
+class ForecastCache:
+    def __init__(self, backend: MemoryCacheBackend | DiskCacheBackend = None, max_age: float = 600, stale_while_revalidate: float = 0, precision: int = 2):
+        self.backend                = backend if backend is not None else MemoryCacheBackend()
+        self.max_age                = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.precision              = precision
+        self.hits                   = 0
+        self.stale_hits             = 0
+        self.misses                 = 0
+        self.revalidations          = 0
+        self.coalesced              = 0
+        self.bytes_saved            = 0
+        self._lock                  = threading.Lock()
+        self._refreshing            = set()
+        self._loading               = {}  # Schlüssel -> Future des laufenden Ladevorgangs
+
+    def make_key(self, params: dict) -> str:
+        latitude  = round(float(params["lat"]), self.precision)
+        longitude = round(float(params["lon"]), self.precision)
+        others    = sorted((key, str(value)) for key, value in params.items() if key not in ("lat", "lon", "appid"))
+        return f"{latitude:.{self.precision}f},{longitude:.{self.precision}f}?" + "&".join(f"{key}={value}" for key, value in others)
+
+    # Liefert die (rohe) Antwort für params aus dem Cache oder lädt sie über loader nach
+    def fetch(self, params: dict, loader) -> bytes:
+        key   = self.make_key(params)
+        entry = self.backend.get(key)
+        now   = time.time()
+
+        if entry is not None:
+            payload, stored_at = entry
+            age = now - stored_at
+
+            if age <= self.max_age:
+                self._record(hits=1, bytes_saved=len(payload))
+                return payload
+
+            if age <= self.max_age + self.stale_while_revalidate:
+                self._record(stale_hits=1, bytes_saved=len(payload))
+                self._revalidate_in_background(key, loader)
+                return payload
+
+        return self._load(key, loader)
+
+    # Lädt einen fehlenden Schlüssel genau einmal, auch wenn mehrere Threads gleichzeitig danach fragen
+    def _load(self, key: str, loader) -> bytes:
+        from concurrent.futures import Future
+
+        with self._lock:
+            future = self._loading.get(key)
+            leader = future is None
+            if leader:
+                future = self._loading[key] = Future()
+
+        if not leader:
+            payload = future.result()
+            self._record(coalesced=1, bytes_saved=len(payload))
+            return payload
+
+        try:
+            # Ein anderer Thread kann den Eintrag zwischen dem ersten Nachschlagen und der Anmeldung gespeichert haben
+            entry = self.backend.get(key)
+            if entry is not None and time.time() - entry[1] <= self.max_age:
+                self._record(hits=1, bytes_saved=len(entry[0]))
+                payload = entry[0]
+            else:
+                self._record(misses=1)
+                payload = loader()
+                self.backend.set(key, payload, time.time())
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(payload)
+            return payload
+        finally:
+            with self._lock:
+                del self._loading[key]
+
+    # Gibt Kennzahlen zu Trefferquote und eingesparten Bytes zurück
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.coalesced + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidations": self.revalidations,
+            "hit_ratio": (self.hits + self.stale_hits + self.coalesced) / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "entries": len(self.backend)
+        }
+
+    def clear(self):
+        self.backend.clear()
+
+    def _record(self, hits: int = 0, stale_hits: int = 0, misses: int = 0, coalesced: int = 0, bytes_saved: int = 0):
+        with self._lock:
+            self.hits        += hits
+            self.stale_hits  += stale_hits
+            self.misses      += misses
+            self.coalesced   += coalesced
+            self.bytes_saved += bytes_saved
+
+    # Aktualisiert einen veralteten Eintrag in einem Hintergrund-Thread (höchstens eine Aktualisierung pro Schlüssel)
+    def _revalidate_in_background(self, key: str, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.backend.set(key, loader(), time.time())
+                with self._lock:
+                    self.revalidations += 1
+            except Exception as e:
+                logger.warning("Aktualisierung von %s im Hintergrund fehlgeschlagen: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
@@ -0,0 +1,199 @@
+import logging
+import os
+import shutil
+import tempfile
+from typing import TYPE_CHECKING, Iterator, List
+
+from .models import ColumnarLocationWeatherData
+
+# pandas und NumPy werden erst beim Lesen geladen
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Liest historische Wetterdaten aus CSV-Dateien im Format DATE,TAVG,TMAX,TMIN,PRCP,CITY (eine Zeile pro Standort und
+# Monat). Braucht weder API-Schlüssel noch Netzwerk; WeatherClient reicht seine CSV-Methoden hierher weiter.
+# Beide Lesemethoden liefern die Standorte alphabetisch sortiert, mit sort=False in der Reihenfolge ihres ersten
+# Auftretens in der Datei.
+class CsvWeatherReader:
+    # Spaltennamen und Datentypen der CSV-Dateien (DATE,TAVG,TMAX,TMIN,PRCP,CITY)
+    csv_columns             = ["date", "temp_avg", "temp_max", "temp_min", "precipitation", "location_name"]
+    csv_temperature_columns = ["temp_avg", "temp_max", "temp_min"]
+    csv_dtypes              = {"date": str, "temp_avg": "float64", "temp_max": "float64", "temp_min": "float64", "precipitation": "float64", "location_name": str}
+
+    def get_weather_data_from_csv(self, file_path: str, sort: bool = True) -> List[ColumnarLocationWeatherData] | None:
+        import pandas as pd
+
+        try:
+            # Liest die CSV-Datei ein
+            df = pd.read_csv(file_path)
+            df.columns = ["date","temp_avg","temp_max","temp_min","precipitation","location_name"]
+            
+            # Konvertiert die Datumsangaben in das richtige Format
+            df["date"] = pd.to_datetime(df["date"], format="%Y-%m")
+
+            # Covert temperature columns to float
+            df[["temp_avg", "temp_max", "temp_min", "precipitation"]] = df[["temp_avg", "temp_max", "temp_min", "precipitation"]].astype(float)
+
+            # Replace missing values
+            df["temp_max"]      = df.groupby("location_name")["temp_max"].transform(lambda x: x.fillna(x.mean()))
+            df["temp_min"]      = df.groupby("location_name")["temp_min"].transform(lambda x: x.fillna(x.mean()))
+            df["temp_avg"]      = df.groupby("location_name")["temp_avg"].transform(lambda x: x.fillna(x.mean()))
+            df["precipitation"] = df["precipitation"].fillna(0)
+
+            locations_weather_data = []
+
+            grouped = df.groupby("location_name", sort=sort)
+            for location_name, group in grouped:
+                # Erstellen ein LocationWeatherData-Objekt für jeden Standort
+                locations_weather_data.append(self._create_csv_location(location_name, group))
+
+            return locations_weather_data
+
+        except Exception as e:
+            logger.error("CSV-Datei %s konnte nicht gelesen werden: %s", file_path, e)
+            return None
+
+
+    # Liest eine CSV-Datei im Format DATE,TAVG,TMAX,TMIN,PRCP,CITY blockweise und liefert einen Standort nach dem anderen.
+    # Der Speicherbedarf ist durch den grössten einzelnen Standort begrenzt statt durch die ganze Datei.
+    # 1. Durchgang: Mittelwerte pro Standort für die Ersetzung fehlender Temperaturen (wie get_weather_data_from_csv).
+    # 2. Durchgang: Sind die Zeilen jedes Standorts zusammenhängend und stehen die Standorte bereits in der gewünschten
+    #    Reihenfolge, werden sie direkt gestreamt; sonst werden sie zuerst auf temporäre CSV-Dateien verteilt
+    #    (siehe _spill_buckets). Die Reihenfolge entspricht in beiden Fällen get_weather_data_from_csv.
+    def iter_weather_data_from_csv(self, file_path: str, chunksize: int = 100_000, sort: bool = True) -> Iterator[ColumnarLocationWeatherData]:
+        import numpy as np
+        import pandas as pd
+
+        sums       = None
+        counts     = None
+        rows       = None
+        seen       = set()
+        order      = []  # Standorte in der Reihenfolge ihres ersten Auftretens
+        last       = None
+        contiguous = True
+
+        for chunk in self._read_csv_chunks(file_path, chunksize):
+            grouped = chunk.groupby("location_name", sort=False)[self.csv_temperature_columns]
+            sums    = grouped.sum() if sums is None else sums.add(grouped.sum(), fill_value=0)
+            counts  = grouped.count() if counts is None else counts.add(grouped.count(), fill_value=0)
+            rows    = grouped.size() if rows is None else rows.add(grouped.size(), fill_value=0)
+
+            # Prüft, ob ein Standort nach einem anderen erneut beginnt
+            names  = chunk["location_name"].to_numpy()
+            starts = np.flatnonzero(np.concatenate(([True], names[1:] != names[:-1])))
+            for location_name in names[starts]:
+                if location_name == last:
+                    continue
+                if location_name in seen:
+                    contiguous = False
+                else:
+                    seen.add(location_name)
+                    order.append(location_name)
+                last = location_name
+
+        if sums is None:
+            return
+
+        means = sums / counts
+        names = sorted(order) if sort else order
+
+        if contiguous and names == order:
+            buffer = []
+            for chunk in self._read_csv_chunks(file_path, chunksize):
+                for location_name, group in chunk.groupby("location_name", sort=False):
+                    if buffer and buffer[0]["location_name"].iat[0] != location_name:
+                        yield self._create_csv_location_from_chunks(buffer, means)
+                        buffer = []
+                    buffer.append(group)
+            if buffer:
+                yield self._create_csv_location_from_chunks(buffer, means)
+            return
+
+        directory = tempfile.mkdtemp(prefix="weather-csv-")
+        try:
+            for path in self._spill_buckets(file_path, chunksize, rows.reindex(names), directory):
+                bucket = pd.read_csv(path, header=None, names=self.csv_columns, dtype=self.csv_dtypes)
+                os.remove(path)
+                # Die Zeilen stehen in der Reihenfolge der Datei, erste Vorkommen innerhalb des Buckets also wie in order
+                for _, group in bucket.groupby("location_name", sort=sort):
+                    yield self._create_csv_location_from_chunks([group], means)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    # Verteilt die Zeilen auf temporäre CSV-Dateien ("Buckets") und gibt deren Pfade in der Reihenfolge von rows zurück.
+    # Jeder Bucket enthält einen zusammenhängenden Bereich der Standorte aus rows mit etwa chunksize Zeilen (mindestens
+    # einen ganzen Standort), höchstens aber max_spill_files Dateien. Pro Block wird jeder betroffene Bucket mit einem
+    # einzigen Schreibvorgang ergänzt; die Dateien bleiben dafür während des Durchgangs geöffnet.
+    max_spill_files = 256
+
+    def _spill_buckets(self, file_path: str, chunksize: int, rows: "pd.Series", directory: str) -> list[str]:
+        import numpy as np
+
+        sizes       = rows.to_numpy().astype(np.int64)
+        bucket_rows = max(chunksize, int(sizes.max()), -(-int(sizes.sum()) // self.max_spill_files))
+        starts      = (np.cumsum(sizes) - sizes) // bucket_rows    # Bucket, in dem die Zeilen des Standorts beginnen
+        _, indices  = np.unique(starts, return_inverse=True)        # Fortlaufend nummeriert, ohne leere Buckets
+        buckets     = dict(zip(rows.index, indices.tolist()))
+
+        paths = [os.path.join(directory, f"{bucket}.csv") for bucket in range(int(indices.max()) + 1)]
+        files = [open(path, "w", encoding="utf-8", newline="") for path in paths]
+        try:
+            for chunk in self._read_csv_chunks(file_path, chunksize):
+                for bucket, group in chunk.groupby(chunk["location_name"].map(buckets), sort=False):
+                    group.to_csv(files[bucket], header=False, index=False)
+        finally:
+            for file in files:
+                file.close()
+        return paths
+
+    # Liest die CSV-Datei blockweise mit festen Spaltennamen und Datentypen
+    def _read_csv_chunks(self, file_path: str, chunksize: int) -> Iterator["pd.DataFrame"]:
+        import pandas as pd
+
+        return pd.read_csv(file_path, header=0, names=self.csv_columns, dtype=self.csv_dtypes, chunksize=chunksize)
+
+    # Fügt die Blöcke eines Standorts zusammen, ersetzt fehlende Werte und erzeugt das Standort-Objekt
+    def _create_csv_location_from_chunks(self, chunks: list["pd.DataFrame"], means: "pd.DataFrame") -> ColumnarLocationWeatherData:
+        import pandas as pd
+
+        group         = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0].reset_index(drop=True)
+        location_name = group["location_name"].iat[0]
+
+        group["date"] = pd.to_datetime(group["date"], format="%Y-%m")
+        for column in self.csv_temperature_columns:
+            group[column] = group[column].fillna(means.at[location_name, column])
+        group["precipitation"] = group["precipitation"].fillna(0)
+
+        return self._create_csv_location(location_name, group)
+
+    # Erzeugt ein spaltenbasiertes Standort-Objekt aus den (bereits bereinigten) CSV-Zeilen eines Standorts
+    def _create_csv_location(self, location_name: str, group: "pd.DataFrame") -> ColumnarLocationWeatherData:
+        import numpy as np
+
+        count = len(group)
+
+        # Spalten direkt übernehmen statt pro Zeile Einzelobjekte zu erzeugen;
+        # Werte, die in der CSV fehlen, werden wie bisher mit None bzw. 0 belegt
+        columns = {
+            "timestamp": np.full(count, None, dtype=object),        # No timestamp in CSV
+            "timezone_offset": np.full(count, None, dtype=object),  # No timezone offset in CSV
+            "date": group["date"].to_numpy(),
+            "temp_morning": np.full(count, None, dtype=object),     # No morning temperature in CSV
+            "temp_day": np.full(count, None, dtype=object),
+            "temp_evening": np.full(count, None, dtype=object),     # No evening temperature in CSV
+            "temp_night": np.full(count, None, dtype=object),       # No night temperature in CSV
+            "temp_min": group["temp_min"].to_numpy(),
+            "temp_max": group["temp_max"].to_numpy(),
+            "temp_avg": group["temp_avg"].to_numpy(),
+            "rain": group["precipitation"].to_numpy(),              # Assuming precipitation is rain
+            "snow": np.zeros(count, dtype=np.int64),                # No snow data in CSV
+            "probability": np.zeros(count, dtype=np.int64)          # No probability data in CSV
+        }
+
+        return ColumnarLocationWeatherData(
+            location_name=location_name,
+            columns=columns
+        )
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from .parser import ForecastParser
+
+
+class Downsampler:
+    # Ein Punkt pro pixels_per_point Pixel Achsenbreite; mehr Punkte sind auf dem Bild nicht unterscheidbar
+    def __init__(self, pixels_per_point: float = 2.0, pixels_per_tick: float = 40.0, method: str = "lttb"):
+        if method not in ("lttb", "W", "M"):
+            raise ValueError("method muss 'lttb', 'W' (wöchentlich) oder 'M' (monatlich) sein.")
+
+        self.pixels_per_point = pixels_per_point
+        self.pixels_per_tick  = pixels_per_tick
+        self.method           = method
+
+    # Anzahl darstellbarer Punkte für die Breite der Achse
+    def point_budget(self, ax) -> int:
+        return max(3, int(self._axis_width(ax) / self.pixels_per_point))
+
+    # Anzahl lesbarer Achsenbeschriftungen für die Breite der Achse
+    def tick_budget(self, ax) -> int:
+        return max(2, int(self._axis_width(ax) / self.pixels_per_tick))
+
+    # Reduziert ein DataFrame für einen Linien- oder Punktplot von column auf höchstens budget Punkte.
+    # Gibt das DataFrame unverändert zurück, wenn es bereits klein genug ist. Sonst wird "date" in Zeitstempel
+    # umgewandelt und entweder per LTTB (Largest Triangle Three Buckets) ausgedünnt oder wöchentlich/monatlich gemittelt.
+    def reduce(self, df: pd.DataFrame, column: str, budget: int) -> pd.DataFrame:
+        if len(df) <= budget:
+            return df
+
+        df = df[["date", column]].assign(date=ForecastParser.to_datetime(df["date"])).dropna().sort_values("date")
+
+        if self.method != "lttb":
+            return self._aggregate(df, {column: "mean"})
+
+        x = df["date"].to_numpy().astype("datetime64[ns]").astype(np.int64).astype(float)
+        y = df[column].to_numpy(dtype=float)
+        return df.iloc[self.lttb_indices(x, y, budget)].reset_index(drop=True)
+
+    # Reduziert ein DataFrame für einen Bereichsplot (low bis high) auf höchstens budget Abschnitte.
+    # Pro Abschnitt bleiben Minimum von low und Maximum von high erhalten, damit keine Extremwerte verschwinden.
+    def reduce_range(self, df: pd.DataFrame, low: str, high: str, budget: int) -> pd.DataFrame:
+        if len(df) <= budget:
+            return df
+
+        df = df[["date", low, high]].assign(date=ForecastParser.to_datetime(df["date"])).dropna().sort_values("date")
+
+        if self.method != "lttb":
+            return self._aggregate(df, {low: "min", high: "max"})
+
+        buckets = np.arange(len(df)) * budget // len(df)
+        grouped = df.groupby(buckets)
+        return pd.DataFrame({
+            "date": grouped["date"].first().to_numpy(),
+            low: grouped[low].min().to_numpy(),
+            high: grouped[high].max().to_numpy()
+        })
+
+    # Wählt höchstens budget gleichmässig verteilte Beschriftungen (Positionen und Texte)
+    def tick_subset(self, positions, labels, budget: int) -> tuple[list, list]:
+        positions = list(positions)
+        labels    = list(labels)
+        if len(positions) <= budget:
+            return positions, labels
+
+        indices = np.unique(np.linspace(0, len(positions) - 1, budget).round().astype(int))
+        return [positions[i] for i in indices], [labels[i] for i in indices]
+
+    # Indizes der per LTTB ausgewählten Punkte; erster und letzter Punkt bleiben immer erhalten
+    @staticmethod
+    def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+        count = len(x)
+        if threshold >= count or threshold < 3:
+            return np.arange(count)
+
+        # Innere Punkte in threshold - 2 Eimer aufteilen
+        edges    = (np.arange(threshold - 1) * (count - 2) // (threshold - 2)) + 1
+        edges    = np.append(edges, count - 1)
+        selected = np.empty(threshold, dtype=np.int64)
+        selected[0]  = 0
+        selected[-1] = count - 1
+
+        previous = 0
+        for bucket in range(threshold - 2):
+            start, end = edges[bucket], edges[bucket + 1]
+            next_start = edges[bucket + 1]
+            next_end   = max(edges[bucket + 2], next_start + 1)
+            average_x  = x[next_start:next_end].mean()
+            average_y  = y[next_start:next_end].mean()
+
+            # Punkt mit der grössten Dreiecksfläche zum vorherigen Punkt und zum Mittel des nächsten Eimers
+            area = np.abs(
+                (x[previous] - average_x) * (y[start:end] - y[previous])
+                - (x[previous] - x[start:end]) * (average_y - y[previous])
+            )
+            previous = start + int(np.argmax(area))
+            selected[bucket + 1] = previous
+
+        return selected
+
+    def _aggregate(self, df: pd.DataFrame, aggregations: dict) -> pd.DataFrame:
+        rule = "W" if self.method == "W" else "MS"
+        return df.resample(rule, on="date").agg(aggregations).dropna().reset_index()
+
+    @staticmethod
+    def _axis_width(ax) -> float:
+        fig = ax.figure
+        return fig.get_figwidth() * fig.dpi * ax.get_position().width
@@ -1,28 +1,162 @@
-import datetime
+import json
+import logging
 import os
-from typing import List
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, List
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
+from .cache import DiskCacheBackend, ForecastCache, GeocodingCache, MemoryCacheBackend
+from .csv_reader import CsvWeatherReader
+from .instrumentation import metrics
 from .singleton import Singleton
-from .models import TemperatureData, PrecipitationData, LocationWeatherData, WindData
+from .models import LocationWeatherData, ColumnarLocationWeatherData
+from .parser import ForecastParser
+from .scheduler import RequestScheduler
 
-class WeatherDataFetcher(Singleton):
-    def __init__(self):
-        if not hasattr(self, 'initialized'):
-            load_dotenv()  # Lädt die .env-Datei
-            self.api_key = os.getenv('OPENWEATHER_API_KEY')
+# pandas und NumPy werden erst für CSV-Daten bzw. DataFrames geladen
+if TYPE_CHECKING:
+    import pandas as pd
 
-            if not self.api_key:
-                raise ValueError("API-Schlüssel nicht gefunden. Bitte stellen Sie sicher, dass eine .env-Datei mit 'OPENWEATHER_API_KEY' existiert.")
+logger = logging.getLogger(__name__)
+
+# Client für die OpenWeatherMap-APIs, vollständig über den Konstruktor konfiguriert: API-Schlüssel, Session,
+# Timeouts, Caches und Scheduler werden übergeben statt aus der Umgebung gelesen. Damit lassen sich mehrere Clients
+# (z. B. mit verschiedenen API-Schlüsseln) in einem Prozess betreiben.
+# Der Verbindungspool wird einmal beim Erstellen in die Session eingehängt; danach verändert der Client weder sich
+# selbst noch die Session. Caches, Scheduler und der Verbindungspool der Session sind selbst threadsicher. Eine Instanz
+# kann daher von beliebig vielen Threads und (über die *_async-Methoden) asyncio-Tasks gemeinsam verwendet werden.
+#   timeout:         Sekunden pro HTTP-Anfrage, auch als (Verbindungsaufbau, Lesen)
+#   session:         eigene requests.Session (z. B. mit Proxy oder Zertifikaten), sonst wird eine erstellt
+#   pool_size:       Anzahl wiederverwendbarer Verbindungen pro Host und zugleich die höchste Parallelität eines
+#                    Abrufs (grössere max_concurrency werden darauf begrenzt)
+#   geocoding_cache, forecast_cache, scheduler: optional, ohne Angabe wird nicht zwischengespeichert bzw. gedrosselt
+class WeatherClient:
+    geo_base_url      = "http://api.openweathermap.org/geo/1.0/direct"
+    onecall_base_url  = "https://api.openweathermap.org/data/3.0/onecall"
+    request_timeout   = 10  # Sekunden pro HTTP-Anfrage
+    default_pool_size = 32  # Anzahl wiederverwendbarer Verbindungen pro Host (werden erst bei Bedarf geöffnet)
+
+    def __init__(
+        self,
+        api_key: str,
+        session: requests.Session = None,
+        timeout: float | tuple[float, float] = None,
+        pool_size: int = None,
+        geocoding_cache: GeocodingCache = None,
+        forecast_cache: ForecastCache = None,
+        scheduler: RequestScheduler = None,
+        parser: ForecastParser = None
+    ):
+        if not api_key:
+            raise ValueError("Ein API-Schlüssel ist erforderlich.")
+
+        self.api_key         = api_key
+        self.request_timeout = timeout if timeout is not None else self.request_timeout
+        self.geocoding_cache = geocoding_cache
+        self.forecast_cache  = forecast_cache
+        self.scheduler       = scheduler
+        self.parser          = parser or ForecastParser()
+
+        # Gemeinsame Session, damit Verbindungen (Keep-Alive) über alle Anfragen wiederverwendet werden
+        self.session   = session or requests.Session()
+        self.pool_size = pool_size or self.default_pool_size
+        self._mount_pool()
+
+    # Erstellt einen Client mit der Konfiguration aus der Umgebung bzw. der .env-Datei:
+    # OPENWEATHER_API_KEY, OPENWEATHER_GEOCODING_CACHE, OPENWEATHER_FORECAST_CACHE, OPENWEATHER_FORECAST_MAX_AGE,
+    # OPENWEATHER_FORECAST_STALE_WHILE_REVALIDATE, OPENWEATHER_CALLS_PER_MINUTE, OPENWEATHER_CALLS_PER_DAY und
+    # OPENWEATHER_POOL_SIZE.
+    # Angaben in overrides (z. B. api_key=..., forecast_cache=...) haben Vorrang; dafür wird nichts aus der
+    # Umgebung erzeugt, also z. B. keine SQLite-Datei geöffnet, wenn ein eigener Cache übergeben wird.
+    @classmethod
+    def from_env(cls, **overrides) -> "WeatherClient":
+        return cls(**cls._settings_from_env(overrides))
+
+    @staticmethod
+    def _settings_from_env(overrides: dict = None) -> dict:
+        from dotenv import load_dotenv
+
+        load_dotenv()  # Lädt die .env-Datei
+        settings = dict(overrides or {})
+
+        settings.setdefault("api_key", os.getenv('OPENWEATHER_API_KEY'))
+        if not settings["api_key"]:
+            raise ValueError("API-Schlüssel nicht gefunden. Bitte stellen Sie sicher, dass eine .env-Datei mit 'OPENWEATHER_API_KEY' existiert.")
+
+        if "pool_size" not in settings and os.getenv('OPENWEATHER_POOL_SIZE'):
+            settings["pool_size"] = int(os.getenv('OPENWEATHER_POOL_SIZE'))
+
+        # Optionaler persistenter Geokodierungs-Cache (Pfad über OPENWEATHER_GEOCODING_CACHE)
+        if "geocoding_cache" not in settings:
+            geocoding_cache_path        = os.getenv('OPENWEATHER_GEOCODING_CACHE')
+            settings["geocoding_cache"] = GeocodingCache(geocoding_cache_path) if geocoding_cache_path else None
+
+        # Antwort-Cache für One Call Anfragen (standardmässig im Speicher, mit OPENWEATHER_FORECAST_CACHE auf der Festplatte)
+        # Auf der Festplatte werden Antworten entfernt, sobald sie auch veraltet nicht mehr geliefert würden
+        if "forecast_cache" not in settings:
+            forecast_cache_path        = os.getenv('OPENWEATHER_FORECAST_CACHE')
+            max_age                    = float(os.getenv('OPENWEATHER_FORECAST_MAX_AGE', 600))
+            stale_while_revalidate     = float(os.getenv('OPENWEATHER_FORECAST_STALE_WHILE_REVALIDATE', 0))
+            settings["forecast_cache"] = ForecastCache(
+                DiskCacheBackend(forecast_cache_path, ttl=max_age + stale_while_revalidate) if forecast_cache_path else MemoryCacheBackend(),
+                max_age=max_age,
+                stale_while_revalidate=stale_while_revalidate
+            )
+
+        # Kontingent pro API-Schlüssel und Wiederholungen bei 429/5xx (OPENWEATHER_CALLS_PER_MINUTE / _PER_DAY)
+        if "scheduler" not in settings:
+            calls_per_day         = os.getenv('OPENWEATHER_CALLS_PER_DAY')
+            settings["scheduler"] = RequestScheduler(
+                calls_per_minute=float(os.getenv('OPENWEATHER_CALLS_PER_MINUTE', 60)),
+                calls_per_day=float(calls_per_day) if calls_per_day else None
+            )
+
+        return settings
+
+    # Meldet Trefferquoten und Kontingent dieses Clients an die Kennzahlen (prefix unterscheidet mehrere Clients,
+    # z. B. "tenant_a" -> "tenant_a_forecast_cache"). Caches und Scheduler können danach weiterhin ersetzt werden.
+    def register_metrics(self, prefix: str = ""):
+        prefix = f"{prefix}_" if prefix else ""
+        metrics.register_source(f"{prefix}geocoding_cache", lambda: self.geocoding_cache.stats() if self.geocoding_cache is not None else None)
+        metrics.register_source(f"{prefix}forecast_cache", lambda: self.forecast_cache.stats() if self.forecast_cache is not None else None)
+        metrics.register_source(f"{prefix}scheduler", lambda: self.scheduler.stats() if self.scheduler is not None else None)
+
+    # Führt eine GET-Anfrage über den Scheduler aus (Kontingent und Wiederholungen), ohne Scheduler direkt
+    # Anzahl Anfragen, Dauer und empfangene Bytes werden pro Endpunkt ("geo" bzw. "onecall") gezählt
+    def _get(self, url: str, params: dict) -> requests.Response:
+        endpoint = "geo" if url == self.geo_base_url else "onecall"
+        with metrics.stage(f"http_{endpoint}"):
+            if self.scheduler is None:
+                response = self.session.get(url, params=params, timeout=self.request_timeout)
+            else:
+                response = self.scheduler.request(self.session, url, params, self.request_timeout)
+
+        metrics.count("http_requests", endpoint=endpoint, status=response.status_code)
+        metrics.count("http_received_bytes", len(response.content), endpoint=endpoint)
+        return response
+
+    # Hängt einen Adapter mit pool_size Verbindungen pro Host ein (nur beim Erstellen, solange die Session noch von
+    # keinem Abruf verwendet wird) und schliesst die ersetzten Adapter samt ihren Verbindungen
+    def _mount_pool(self):
+        adapter  = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        replaced = [self.session.adapters.get(prefix) for prefix in ("http://", "https://")]
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        for previous in replaced:
+            if previous is not None and previous not in self.session.adapters.values():
+                previous.close()
 
-            self.initialized = True  # Verhindert mehrfache Initialisierungen
-    
 
     def get_location_coordinates(self, city_name, state_code: str = None, country_code: str = None) -> tuple[float, float] | List[tuple[float, float]] | None:
-        base_url = "http://api.openweathermap.org/geo/1.0/direct"
-        
+        base_url = self.geo_base_url
+
+        # Bekannte Standorte direkt aus dem Cache beantworten, ohne Netzwerkzugriff
+        if self.geocoding_cache is not None:
+            cached = self.geocoding_cache.get(city_name, state_code, country_code)
+            if cached is not None:
+                return cached
+
         # Konstruktion der Abfragezeichenfolge mit optionalem Bundesland- und Ländercode (ISO 3166)
         query = city_name
         if state_code:
@@ -38,7 +172,7 @@ class WeatherDataFetcher(Singleton):
 
         try:
             # Führt die API-Anfrage aus
-            response = requests.get(base_url, params=params)
+            response = self._get(base_url, params)
             response.raise_for_status() 
             data = response.json()
 
@@ -49,6 +183,8 @@ class WeatherDataFetcher(Singleton):
                     # Wenn nur ein Ergebnis zurückgegeben wird, extrahiere die Koordinaten
                     latitude      = data[0].get('lat')
                     longitude     = data[0].get('lon')
+                    if self.geocoding_cache is not None:
+                        self.geocoding_cache.set(city_name, state_code, country_code, (latitude, longitude))
                     return (latitude, longitude)
                 else:
                     for location in data:
@@ -59,12 +195,28 @@ class WeatherDataFetcher(Singleton):
                 raise ValueError("Keine Daten für den angegebenen Ort gefunden.")
 
         except Exception as e:
-            print(f"Ein Fehler ist aufgetreten: {e}")
+            logger.error("Geokodierung von %s fehlgeschlagen: %s", query, e, extra={"location": city_name})
             return None
 
 
     def get_weather_locaiton_forecast_data_by_coordinates(self, location_name: str, latitude: float, longitude: float) -> LocationWeatherData | None:
-        base_url = "https://api.openweathermap.org/data/3.0/onecall"
+        try:
+            # Führt die API-Anfrage aus (bzw. beantwortet sie aus dem Antwort-Cache)
+            data = self._get_forecast_payload(latitude, longitude)
+
+            if data:
+                return self.parser.parse_daily(location_name, latitude, longitude, data)
+            else:
+                raise ValueError("Keine Daten für die angegebenen Koordinaten gefunden.")
+
+        except Exception as e:
+            logger.error("Vorhersage für %s fehlgeschlagen: %s", location_name, e, extra={"location": location_name})
+            return None
+        
+    
+    # Lädt die One Call Antwort; ist ein Antwort-Cache gesetzt, wird die rohe Antwort dort zwischengespeichert
+    def _get_forecast_payload(self, latitude: float, longitude: float) -> dict:
+        base_url = self.onecall_base_url
         params = {
             "lat": latitude,
             "lon": longitude,
@@ -72,154 +224,130 @@ class WeatherDataFetcher(Singleton):
             "exclude": "current,minutely,hourly,alerts",
             "units": "metric"
         }
-        
-        try:
-            # Führt die API-Anfrage aus
-            response = requests.get(base_url, params=params)
+
+        def load() -> bytes:
+            response = self._get(base_url, params)
             response.raise_for_status()
-            data = response.json()
-        
-            if data:
-                temperature_data   = []
-                precipitation_data = []
-                wind_data          = []
-
-                # Extrahiert für jeden Tag die Vorhersagedaten (8 Tage)
-                forecast_data   = data.get("daily")
-                for forecast_day in forecast_data:
-                    timestamp       = forecast_day.get("dt")  # Zeitstempel der Vorhersage
-                    timezone_offset = data.get("timezone_offset")  # Zeitzonen-Offset
-                    
-                    # Extrahiert Temperaturdaten
-                    temp    = forecast_day.get("temp", {})
-                    morning = temp.get("morn")  # Morgentemperatur
-                    day     = temp.get("day")   # Tagestemperatur
-                    evening = temp.get("eve")   # Abendtemperatur
-                    night   = temp.get("night") # Nachttemperatur
-                    min     = temp.get("min")   # Minimaltemperatur
-                    max     = temp.get("max")   # Maximaltemperatur
-
-                    forecast_day_temperature_data = TemperatureData(
-                        timestamp,
-                        timezone_offset,
-                        date=datetime.date.fromtimestamp(timestamp + timezone_offset).strftime("%d.%m.%Y"),
-                        morning=morning,
-                        day=day,
-                        evening=evening,
-                        night=night,
-                        min=min,
-                        max=max,
-                        avg=(morning + day + evening + night) / 4  # Durchschnittstemperatur
-                    )
-                    temperature_data.append(forecast_day_temperature_data)
-
-                    # Extrahiert Niederschlagsdaten
-                    rain        = forecast_day.get("rain", 0)  # Regenmenge
-                    snow        = forecast_day.get("snow", 0)  # Schneemenge
-                    probability = forecast_day.get("pop", 0)  # Niederschlagswahrscheinlichkeit
-
-                    forecast_day_precipitation_data = PrecipitationData(
-                        timestamp,
-                        timezone_offset,
-                        date=datetime.date.fromtimestamp(timestamp + timezone_offset).strftime("%d.%m.%Y"),
-                        rain=rain,
-                        snow=snow,
-                        probability=probability
-                    )
-                    precipitation_data.append(forecast_day_precipitation_data)
-
-                    # Extrahiert Winddaten
-                    speed   = forecast_day.get("wind_speed", 0)  # Windgeschwindigkeit
-                    degrees = forecast_day.get("wind_deg", 0)  # Windrichtung
-
-                    wd = WindData(
-                        timestamp,
-                        timezone_offset,
-                        date=datetime.date.fromtimestamp(timestamp + timezone_offset).strftime("%d.%m.%Y"),
-                        speed=speed,
-                        degrees=degrees
-                    )
-                    wind_data.append(wd)
-
-                # Erstellt ein LocationWeatherData-Objekt, um die Wetterdaten zu speichern
-                location_weather_data = LocationWeatherData(
-                    location_name,
-                    latitude,
-                    longitude,
-                    temperature_data,
-                    precipitation_data,
-                    wind_data
-                )
-                
-                return location_weather_data
-            else:
-                raise ValueError("Keine Daten für die angegebenen Koordinaten gefunden.")
+            return response.content
+
+        payload = load() if self.forecast_cache is None else self.forecast_cache.fetch(params, load)
+        with metrics.stage("json"):
+            return json.loads(payload)
+
+
+    # Ruft die Vorhersagen für mehrere Standorte parallel ab.
+    # Jeder Standort ist ein Dictionary mit "name" und optional "state_code" / "country_code".
+    # Die Ergebnisse stehen in derselben Reihenfolge wie die Eingabe, fehlgeschlagene Standorte sind None.
+    # Mit resume_from (Ergebnis eines früheren Aufrufs) werden nur die fehlgeschlagenen Standorte erneut abgerufen.
+    def fetch_forecasts(self, locations: List[dict], max_concurrency: int = 8, resume_from: List[LocationWeatherData | None] = None) -> List[LocationWeatherData | None]:
+        return self._map_locations(self._fetch_location_forecast, locations, max_concurrency, resume_from)
+
+    # Wie fetch_forecasts, liefert aber alle erfolgreich abgerufenen Standorte als ein gemeinsames DataFrame
+    # (eine Zeile pro Standort und Vorhersagetag, Spalte "location_name" kennzeichnet den Standort).
+    # Schlägt das gemeinsame Parsen fehl, werden die Antworten einzeln geprüft und fehlerhafte Standorte ausgelassen.
+    def fetch_forecasts_dataframe(self, locations: List[dict], max_concurrency: int = 8) -> "pd.DataFrame":
+        responses = [response for response in self.fetch_forecast_payloads(locations, max_concurrency) if response is not None]
+        try:
+            return self.parser.parse_batch(responses)
+        except Exception:
+            return self.parser.parse_batch([response for response in responses if self._parse_location(response) is not None])
+
+    # Lädt die rohen One Call Antworten mehrerer Standorte parallel als (Name, Breite, Länge, Antwort) bzw. None
+    def fetch_forecast_payloads(self, locations: List[dict], max_concurrency: int = 8, resume_from: List[tuple[str, float, float, dict] | None] = None) -> List[tuple[str, float, float, dict] | None]:
+        return self._map_locations(self._fetch_location_payload, locations, max_concurrency, resume_from)
 
+    # Varianten für asyncio: der Abruf läuft in einem Worker-Thread, die Ereignisschleife bleibt frei.
+    # Mehrere Tasks können denselben Client gleichzeitig verwenden.
+    async def fetch_forecasts_async(self, locations: List[dict], max_concurrency: int = 8, resume_from: List[LocationWeatherData | None] = None) -> List[LocationWeatherData | None]:
+        import asyncio
+
+        return await asyncio.to_thread(self.fetch_forecasts, locations, max_concurrency, resume_from)
+
+    async def fetch_forecast_payloads_async(self, locations: List[dict], max_concurrency: int = 8, resume_from: List[tuple[str, float, float, dict] | None] = None) -> List[tuple[str, float, float, dict] | None]:
+        import asyncio
+
+        return await asyncio.to_thread(self.fetch_forecast_payloads, locations, max_concurrency, resume_from)
+
+    # Wendet function parallel auf alle Standorte an; bereits vorhandene Ergebnisse aus resume_from werden übernommen.
+    # Es laufen höchstens pool_size Anfragen gleichzeitig, damit jede Anfrage eine Verbindung aus dem Pool erhält.
+    def _map_locations(self, function, locations: List[dict], max_concurrency: int, resume_from: list = None) -> list:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency muss mindestens 1 sein.")
+        if resume_from is not None and len(resume_from) != len(locations):
+            raise ValueError("resume_from muss genauso viele Einträge wie locations enthalten.")
+
+        results = list(resume_from) if resume_from is not None else [None] * len(locations)
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, self.pool_size)) as executor:
+            for i, result in zip(pending, executor.map(function, [locations[i] for i in pending])):
+                results[i] = result
+
+        return results
+
+    # Ermittelt die Koordinaten eines Standorts und lädt anschliessend dessen Vorhersage
+    def _fetch_location_forecast(self, location: dict) -> LocationWeatherData | None:
+        response = self._fetch_location_payload(location)
+        if response is None:
+            return None
+        return self._parse_location(response)
+
+    # Parst die Antwort eines Standorts; eine fehlerhafte Antwort wird protokolliert und ergibt None
+    def _parse_location(self, response: tuple[str, float, float, dict]) -> ColumnarLocationWeatherData | None:
+        location_name = response[0]
+        try:
+            return self.parser.parse_daily(*response)
         except Exception as e:
-            print(f"Ein Fehler ist aufgetreten: {e}")
+            logger.error("Antwort für %s konnte nicht verarbeitet werden: %s", location_name, e, extra={"location": location_name})
             return None
-        
-    
-    def get_weather_data_from_csv(self, file_path: str) -> LocationWeatherData | None:
+
+    # Lädt die rohe One Call Antwort eines Standorts als (Name, Breite, Länge, Antwort) oder None bei Fehlern
+    def _fetch_location_payload(self, location: dict) -> tuple[str, float, float, dict] | None:
+        location_name = location.get("name")
         try:
-            # Liest die CSV-Datei ein
-            df = pd.read_csv(file_path)
-            df.columns = ["date","temp_avg","temp_max","temp_min","precipitation","location_name"]
-            
-            # Konvertiert die Datumsangaben in das richtige Format
-            df["date"] = pd.to_datetime(df["date"], format="%Y-%m")
-
-            # Covert temperature columns to float
-            df[["temp_avg", "temp_max", "temp_min", "precipitation"]] = df[["temp_avg", "temp_max", "temp_min", "precipitation"]].astype(float)
-
-            # Replace missing values
-            df["temp_max"]      = df.groupby("location_name")["temp_max"].transform(lambda x: x.fillna(x.mean()))
-            df["temp_min"]      = df.groupby("location_name")["temp_min"].transform(lambda x: x.fillna(x.mean()))
-            df["temp_avg"]      = df.groupby("location_name")["temp_avg"].transform(lambda x: x.fillna(x.mean()))
-            df["precipitation"] = df["precipitation"].fillna(0)
-
-            locations_weather_data = []
-
-            grouped = df.groupby("location_name")
-            for location_name, group in grouped:
-                temperature_data = []
-                precipitation_data = []
-
-                for _, row in group.iterrows():
-                    temp_data = TemperatureData(
-                        timestamp=None,  # No timestamp in CSV
-                        timezone_offset=None,  # No timezone offset in CSV
-                        date=row["date"],
-                        morning=None,  # No morning temperature in CSV
-                        day=None,
-                        evening=None,  # No evening temperature in CSV
-                        night=None,  # No night temperature in CSV
-                        min=row["temp_min"],
-                        max=row["temp_max"],
-                        avg=row["temp_avg"]
-                    )
-                    temperature_data.append(temp_data)
-
-                    precip_data = PrecipitationData(
-                        timestamp=None,  # No timestamp in CSV
-                        timezone_offset=None,  # No timezone offset in CSV
-                        date=row["date"],
-                        rain=row["precipitation"],  # Assuming precipitation is rain
-                        snow=0,  # No snow data in CSV
-                        probability=0  # No probability data in CSV
-                    )
-                    precipitation_data.append(precip_data)
-
-                # Erstellen ein LocationWeatherData-Objekt für jeden Standort
-                location_weather_data = LocationWeatherData(
-                    location_name=location_name,
-                    temperature_data=temperature_data,
-                    precipitation_data=precipitation_data
-                )
-                locations_weather_data.append(location_weather_data)
-
-            return locations_weather_data
+            with metrics.stage("geocode", location_name):
+                coordinates = self.get_location_coordinates(location_name, location.get("state_code"), location.get("country_code"))
+
+            if not coordinates:
+                logger.warning("Koordinaten für %s konnten nicht abgerufen werden.", location, extra={"location": location_name})
+                return None
+
+            with metrics.stage("download", location_name):
+                data = self._get_forecast_payload(coordinates[0], coordinates[1])
+            if not data:
+                raise ValueError("Keine Daten für die angegebenen Koordinaten gefunden.")
+
+            return (location_name, coordinates[0], coordinates[1], data)
 
         except Exception as e:
-            print(f"Ein Fehler ist aufgetreten: {e}")
-            return None
\ No newline at end of file
+            logger.error("Abruf für %s fehlgeschlagen: %s", location_name, e, extra={"location": location_name})
+            return None
+
+
+    # CSV-Dateien werden ohne API-Zugriff gelesen (CsvWeatherReader); die Methoden bleiben für bestehende Aufrufer erhalten
+    def get_weather_data_from_csv(self, file_path: str, sort: bool = True) -> List[ColumnarLocationWeatherData] | None:
+        return CsvWeatherReader().get_weather_data_from_csv(file_path, sort)
+
+    def iter_weather_data_from_csv(self, file_path: str, chunksize: int = 100_000, sort: bool = True) -> Iterator[ColumnarLocationWeatherData]:
+        return CsvWeatherReader().iter_weather_data_from_csv(file_path, chunksize, sort)
+
+
+# Standard-Client wie bisher: eine gemeinsame Instanz pro Prozess, konfiguriert über die Umgebung bzw. .env-Datei
+# (siehe WeatherClient.from_env). Erstellen und Initialisieren sind threadsicher; die Kennzahlen der Caches und des
+# Schedulers werden ohne Präfix gemeldet. Für eigene Schlüssel, Sessions oder Caches WeatherClient verwenden.
+class WeatherDataFetcher(Singleton, WeatherClient):
+    def __init__(self):
+        with self._singleton_lock:
+            if not hasattr(self, 'initialized'):
+                WeatherClient.__init__(self, **WeatherClient._settings_from_env())
+                self.register_metrics()
+
+                self.initialized = True  # Verhindert mehrfache Initialisierungen
+
+    # Liefert die gemeinsame Instanz; sie liest ihre Konfiguration immer aus der Umgebung. Abweichende Einstellungen
+    # würden die Instanz aller übrigen Aufrufer verändern und sind daher nur mit WeatherClient.from_env möglich.
+    @classmethod
+    def from_env(cls, **overrides) -> "WeatherDataFetcher":
+        if overrides:
+            raise TypeError("WeatherDataFetcher übernimmt keine Einstellungen; dafür WeatherClient.from_env(...) verwenden.")
+        return cls()
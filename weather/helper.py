@@ -1,10 +1,22 @@
 from typing import List
+import numpy as np
 import pandas as pd
-from .models import LocationWeatherData
+from .instrumentation import metrics
+from .models import ColumnarLocationWeatherData, LocationWeatherData
+from .parser import ForecastParser
 
 class WeatherHelper:
     def create_dataframe(self, data: LocationWeatherData) -> pd.DataFrame:
-        
+        with metrics.stage("dataframe", data.location_name):
+            return self._create_dataframe(data)
+
+    def _create_dataframe(self, data: LocationWeatherData) -> pd.DataFrame:
+
+        if isinstance(data, ColumnarLocationWeatherData):
+            # Spaltenbasierte Daten ohne Merge als DataFrame zurückgeben; die Kopie (wenige Zeilen) sorgt dafür,
+            # dass Änderungen am DataFrame die Spalten des Objekts nicht verändern (ohne Kopie: to_dataframe())
+            return data.to_dataframe(copy=True)
+
         if data.wind_data is not None:
             # Wenn Winddaten vorhanden sind, Temperatur-, Niederschlags- und Winddaten zusammenführen (API)
             temp_df = pd.DataFrame([vars(entry) for entry in data.temperature_data])
@@ -34,20 +46,107 @@ class WeatherHelper:
 
         return merged_df
     
+    # Behält in jedem DataFrame nur die Zeilen, deren Datum in allen DataFrames vorkommt.
+    # Alle Datumswerte werden gemeinsam kodiert und in einem Schritt gezählt, statt pro DataFrame Mengen zu bilden.
     def normalize_dataframes_on_date(self, dataframes: List[pd.DataFrame]) -> List[pd.DataFrame]:
-        # Schritt 1: Erstellen einer Liste von Mengen mit allen einzigartigen Daten aus der Spalte "date" jedes DataFrames
-        date_sets = []
-        for df in dataframes:
-            date_sets.append(set(df["date"]))
-
-        # Schritt 2: Berechnung der Schnittmenge aller Datums-Mengen, um gemeinsame Daten in allen DataFrames zu finden
-        common_dates = set.intersection(*date_sets)
-
-        # Schritt 3: Filtern jedes DataFrames, um nur Zeilen mit gemeinsamen Daten zu behalten, und Zurücksetzen der Indizes
-        normalized = []
-        for df in dataframes:
-            filtered_df = df[df["date"].isin(common_dates)].reset_index(drop=True)
-            normalized.append(filtered_df)
-
-        # Schritt 4: Rückgabe der Liste der normalisierten DataFrames
-        return normalized
\ No newline at end of file
+        if not dataframes:
+            return []
+
+        with metrics.stage("normalize"):
+            mask    = self._common_date_mask(dataframes)
+            offsets = np.cumsum([0] + [len(df) for df in dataframes])
+
+            normalized = []
+            for i, df in enumerate(dataframes):
+                filtered_df = df[mask[offsets[i]:offsets[i + 1]]].reset_index(drop=True)
+                normalized.append(filtered_df)
+
+            return normalized
+
+    # Richtet viele Standorte in einem Schritt an einem gemeinsamen, chronologisch sortierten Datumsindex aus.
+    # how:    "inner" (nur Daten, die überall vorkommen, wie normalize_dataframes_on_date) oder "outer" (alle Daten)
+    # fill:   Umgang mit fehlenden Werten bei "outer": None (NaN), "ffill", "bfill", "interpolate" oder ein fester Wert
+    # layout: "long"  -> ein DataFrame mit MultiIndex (location, date)
+    #         "wide"  -> ein DataFrame mit Index date und Spalten (Messgrösse, location)
+    #         "views" -> {Standort: DataFrame}, alle mit demselben Datumsindex-Objekt
+    def align_dataframes_on_date(
+        self,
+        dataframes: dict[str, pd.DataFrame] | List[pd.DataFrame],
+        how: str = "inner",
+        fill: str | float | None = None,
+        layout: str = "long"
+    ) -> pd.DataFrame | dict[str, pd.DataFrame]:
+        if how not in ("inner", "outer"):
+            raise ValueError("how muss 'inner' oder 'outer' sein.")
+        if layout not in ("long", "wide", "views"):
+            raise ValueError("layout muss 'long', 'wide' oder 'views' sein.")
+
+        if not isinstance(dataframes, dict):
+            dataframes = dict(enumerate(dataframes))
+        names  = list(dataframes)
+        frames = list(dataframes.values())
+
+        if how == "inner":
+            mask    = self._common_date_mask(frames)
+            offsets = np.cumsum([0] + [len(df) for df in frames])
+            frames  = [df[mask[offsets[i]:offsets[i + 1]]] for i, df in enumerate(frames)]
+
+        long_df = pd.concat(frames, keys=names, names=["location", None]).droplevel(1).set_index("date", append=True)
+        if long_df.index.duplicated().any():
+            raise ValueError("Jeder Standort darf jedes Datum nur einmal enthalten.")
+
+        # Gemeinsamer Datumsindex in chronologischer Reihenfolge (API-Daten sind Zeichenketten "TT.MM.JJJJ")
+        dates      = long_df.index.get_level_values("date").unique()
+        date_index = dates[np.argsort(self._date_sort_key(dates), kind="stable")]
+        date_index.name = "date"
+
+        wide_df = long_df.unstack("location").reindex(date_index)
+        wide_df = self._fill(wide_df, fill)
+        wide_df = wide_df.reindex(columns=pd.MultiIndex.from_product([long_df.columns, names], names=[None, "location"]))
+
+        if layout == "wide":
+            return wide_df
+
+        if layout == "views":
+            return {name: wide_df.xs(name, axis=1, level="location").set_axis(date_index, axis=0) for name in names}
+
+        result = wide_df.stack("location", future_stack=True).swaplevel("date", "location")
+        return result.reindex(pd.MultiIndex.from_product([names, date_index], names=["location", "date"]))[list(long_df.columns)]
+
+    # Boolesche Maske über alle Zeilen aller DataFrames: True, wenn das Datum in jedem DataFrame vorkommt
+    def _common_date_mask(self, dataframes: List[pd.DataFrame]) -> np.ndarray:
+        lengths       = [len(df) for df in dataframes]
+        codes, unique = pd.factorize(pd.concat([df["date"] for df in dataframes], ignore_index=True))
+        frame_ids     = np.repeat(np.arange(len(dataframes)), lengths)
+
+        # Jedes (DataFrame, Datum)-Paar nur einmal zählen; fehlende Datumswerte (Code -1) sind nie gemeinsam
+        valid   = codes >= 0
+        pairs   = np.unique(frame_ids[valid] * len(unique) + codes[valid])
+        present = np.bincount(pairs % max(len(unique), 1), minlength=len(unique))
+        common  = present == len(dataframes)
+
+        mask        = np.zeros(len(codes), dtype=bool)
+        mask[valid] = common[codes[valid]]
+        return mask
+
+    @staticmethod
+    def _date_sort_key(dates: pd.Index) -> np.ndarray:
+        parsed = ForecastParser.to_datetime(dates, errors="coerce")
+        if parsed.isna().any():
+            parsed = pd.to_datetime(dates, errors="coerce")
+        return parsed.to_numpy()
+
+    @staticmethod
+    def _fill(df: pd.DataFrame, fill: str | float | None) -> pd.DataFrame:
+        if fill is None:
+            return df
+        if fill == "ffill":
+            return df.ffill()
+        if fill == "bfill":
+            return df.bfill()
+        if fill == "interpolate":
+            numeric = df.select_dtypes("number").columns
+            df = df.copy()
+            df[numeric] = df[numeric].interpolate(limit_direction="both")
+            return df
+        return df.fillna(fill)
@@ -0,0 +1,249 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Laufzeit-Kennzahlen der Pipeline (Abruf, Parsen, DataFrames, Plots).
+# - stage(name, location): misst die Dauer einer Phase (Anzahl, Summe, Minimum, Maximum). Pro Standort wird nur mit
+#   per_location=True verbucht, da bei vielen Standorten sonst für jeden ein Eintrag pro Phase dazukommt
+# - count(name, value, **labels): Zähler, z. B. empfangene Bytes pro Endpunkt
+# - register_source(name, stats): Kennzahlen anderer Komponenten (z. B. Trefferquoten der Caches), die bei jedem
+#   snapshot() abgefragt werden
+# - profile(): optionale Aufzeichnung mit cProfile und tracemalloc
+# Die Ergebnisse lassen sich als JSON oder im Textformat von Prometheus exportieren.
+class Instrumentation:
+    def __init__(self, enabled: bool = True, per_location: bool = False):
+        self.enabled      = enabled
+        self.per_location = per_location
+        self._stages      = {}  # (Phase, Standort oder None) -> [Anzahl, Summe, Minimum, Maximum]
+        self._counters    = {}  # (Name, ((Label, Wert), ...)) -> Wert
+        self._sources     = {}
+        self._profile     = None
+        self._lock        = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, location: str = None):
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, location)
+
+    # Verbucht eine bereits gemessene Dauer (Sekunden) für eine Phase; location zählt nur mit per_location=True
+    def record(self, name: str, seconds: float, location: str = None):
+        with self._lock:
+            self._add(name, None, seconds)
+            if location is not None and self.per_location:
+                self._add(name, location, seconds)
+
+    def count(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    # stats ist eine Funktion ohne Argumente, die ein Dictionary mit Kennzahlen (oder None) zurückgibt
+    def register_source(self, name: str, stats):
+        with self._lock:
+            self._sources[name] = stats
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._profile = None
+
+    # Zeichnet für die Dauer des Blocks CPU-Zeit pro Funktion (cProfile) und Speicherbelegung (tracemalloc) auf
+    @contextmanager
+    def profile(self, cpu: bool = True, memory: bool = True, top: int = 25):
+        import cProfile
+        import io
+        import pstats
+        import tracemalloc
+
+        profiler = cProfile.Profile() if cpu else None
+        started  = memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+
+        capture = {}
+        try:
+            yield capture
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+                capture["profiler"] = profiler
+                capture["cpu"]      = stream.getvalue()
+
+            if memory:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                if started:
+                    tracemalloc.stop()
+                capture["memory"] = {
+                    "current_bytes": current,
+                    "peak_bytes": peak,
+                    "top": [
+                        {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                        for stat in snapshot.statistics("lineno")[:top]
+                    ]
+                }
+
+            with self._lock:
+                self._profile = capture
+
+    # Alle Kennzahlen als Dictionary (Phasen gesamt und ggf. pro Standort, Zähler, Quellen, ggf. Profil)
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages    = dict(self._stages)
+            counters  = dict(self._counters)
+            sources   = dict(self._sources)
+            profile   = self._profile
+
+        result = {"stages": {}, "locations": {}, "counters": [], "sources": {}}
+        for (name, location), (count, total, minimum, maximum) in stages.items():
+            entry = {"count": count, "seconds": total, "min_seconds": minimum, "max_seconds": maximum}
+            if location is None:
+                result["stages"][name] = entry
+            else:
+                result["locations"].setdefault(location, {})[name] = entry
+
+        for (name, labels), value in counters.items():
+            result["counters"].append({"name": name, "labels": dict(labels), "value": value})
+
+        for name, stats in sources.items():
+            try:
+                values = stats()
+            except Exception as e:
+                logger.warning("Kennzahlen von %s konnten nicht gelesen werden: %s", name, e)
+                continue
+            if values is not None:
+                result["sources"][name] = values
+
+        if profile is not None:
+            result["profile"] = {key: value for key, value in profile.items() if key != "profiler"}
+        return result
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=indent, default=str)
+
+    # Textformat von Prometheus (z. B. für den Textfile-Collector des node_exporter). Die Zeiten pro Standort stehen in
+    # eigenen Metriken (location_stage_*), damit eine Summe über stage_seconds_total nichts doppelt zählt
+    def to_prometheus(self, prefix: str = "weather") -> str:
+        snapshot = self.snapshot()
+        lines    = []
+
+        def metric(name: str, kind: str, samples: list[tuple[dict, float]]):
+            if not samples:
+                return
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{self._labels(labels)} {self._value(value)}")
+
+        def stage_metrics(kind: str, stage_samples: list[tuple[dict, dict]]):
+            metric(f"{kind}_seconds_total", "counter", [(labels, entry["seconds"]) for labels, entry in stage_samples])
+            metric(f"{kind}_calls_total", "counter", [(labels, entry["count"]) for labels, entry in stage_samples])
+            metric(f"{kind}_max_seconds", "gauge", [(labels, entry["max_seconds"]) for labels, entry in stage_samples])
+
+        stage_metrics("stage", [({"stage": name}, entry) for name, entry in snapshot["stages"].items()])
+        stage_metrics("location_stage", [
+            ({"stage": name, "location": location}, entry)
+            for location, stages in snapshot["locations"].items()
+            for name, entry in stages.items()
+        ])
+
+        counters = {}
+        for counter in snapshot["counters"]:
+            counters.setdefault(counter["name"], []).append((counter["labels"], counter["value"]))
+        for name, samples in counters.items():
+            metric(f"{self._metric_name(name)}_total", "counter", samples)
+
+        # Numerische Kennzahlen der Quellen als Gauges, z. B. weather_forecast_cache_hit_ratio
+        for source, values in snapshot["sources"].items():
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metric(self._metric_name(f"{source}_{key}"), "gauge", [({}, value)])
+
+        if "profile" in snapshot and "memory" in snapshot["profile"]:
+            metric("memory_peak_bytes", "gauge", [({}, snapshot["profile"]["memory"]["peak_bytes"])])
+
+        return "\n".join(lines) + "\n"
+
+    def _add(self, name: str, location: str | None, seconds: float):
+        entry = self._stages.get((name, location))
+        if entry is None:
+            self._stages[(name, location)] = [1, seconds, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2]  = min(entry[2], seconds)
+            entry[3]  = max(entry[3], seconds)
+
+    @staticmethod
+    def _metric_name(name: str) -> str:
+        return "".join(character if character.isalnum() or character == "_" else "_" for character in name)
+
+    # Zahlen im Format von Prometheus (NaN, +Inf, -Inf)
+    @staticmethod
+    def _value(value: float) -> str:
+        value = float(value)
+        if value != value:
+            return "NaN"
+        if value in (float("inf"), float("-inf")):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+
+    @staticmethod
+    def _labels(labels: dict) -> str:
+        if not labels:
+            return ""
+        escaped = {
+            key: str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+            for key, value in labels.items()
+        }
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped.items()) + "}"
+
+
+# Formatiert Log-Einträge als eine JSON-Zeile pro Eintrag, inklusive zusätzlicher Felder aus extra={...}
+class JsonFormatter(logging.Formatter):
+    reserved = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self.reserved})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+# Richtet die Ausgabe der Log-Einträge des Pakets ein (Text oder JSON auf stderr)
+def configure_logging(level: int | str = logging.INFO, json_format: bool = False):
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    package_logger = logging.getLogger("weather")
+    package_logger.handlers[:] = [handler]
+    package_logger.setLevel(level)
+    package_logger.propagate = False
+
+
+logger = logging.getLogger(__name__)
+
+# Gemeinsame Instanz, in die Fetcher, Parser, Helper und Plotter ihre Messungen schreiben
+metrics = Instrumentation()
@@ -1,4 +1,10 @@
 import datetime
+from typing import TYPE_CHECKING
+
+from .instrumentation import metrics
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class WeatherData:
     def __init__(
@@ -92,3 +98,130 @@ class LocationWeatherData:
         for attr, value in vars(self).items():
             attrs += f"  {attr}={value}\n"
         return f"{self.__class__.__name__}(\n{attrs}\n)"
+
+
+class ColumnarLocationWeatherData(LocationWeatherData):
+    # Spalten in der Reihenfolge von WeatherHelper.create_dataframe
+    frame_columns = [
+        "date", "temp_morning", "temp_day", "temp_evening", "temp_night", "temp_min", "temp_max", "temp_avg",
+        "rain", "snow", "probability", "wind_speed", "wind_degrees"
+    ]
+
+    # Zuordnung der Attribute der Einzelobjekte zu den Spalten
+    views = {
+        "temperature_data": (TemperatureData, {
+            "morning": "temp_morning", "day": "temp_day", "evening": "temp_evening", "night": "temp_night",
+            "min": "temp_min", "max": "temp_max", "avg": "temp_avg"
+        }),
+        "precipitation_data": (PrecipitationData, {"rain": "rain", "snow": "snow", "probability": "probability"}),
+        "wind_data": (WindData, {"speed": "wind_speed", "degrees": "wind_degrees"})
+    }
+
+    # Spaltenbasierte Variante von LocationWeatherData: ein NumPy-Array pro Messgrösse statt ein Objekt pro Tag.
+    # temperature_data, precipitation_data und wind_data bleiben als Listen von Einzelobjekten verfügbar,
+    # werden aber erst beim ersten Zugriff aus den Spalten erzeugt.
+    def __init__(
+        self,
+        location_name: str,
+        latitude: float = None,
+        longitude: float = None,
+        columns: dict[str, "np.ndarray"] = None
+    ):
+        self.location_name = location_name
+        self.latitude      = latitude
+        self.longitude     = longitude
+        self.columns       = columns if columns is not None else {}
+        self._view_cache   = {}
+
+    # Wandelt ein objektbasiertes LocationWeatherData in die Spaltenform um
+    @classmethod
+    def from_location_weather_data(cls, data: LocationWeatherData) -> "ColumnarLocationWeatherData":
+        if isinstance(data, ColumnarLocationWeatherData):
+            return data
+
+        columns = {}
+        for attribute, (_, mapping) in cls.views.items():
+            entries = getattr(data, attribute)
+            if entries is None:
+                continue
+            if not isinstance(entries, list):
+                entries = [entries]
+            if "timestamp" not in columns:
+                columns["timestamp"]       = cls._to_array([entry.timestamp for entry in entries])
+                columns["timezone_offset"] = cls._to_array([entry.timezone_offset for entry in entries])
+                columns["date"]            = cls._to_array([entry.date for entry in entries])
+            for field, column in mapping.items():
+                columns[column] = cls._to_array([getattr(entry, field) for entry in entries])
+
+        return cls(data.location_name, data.latitude, data.longitude, columns)
+
+    @property
+    def temperature_data(self) -> list[TemperatureData] | None:
+        return self._view("temperature_data")
+
+    @property
+    def precipitation_data(self) -> list[PrecipitationData] | None:
+        return self._view("precipitation_data")
+
+    @property
+    def wind_data(self) -> list[WindData] | None:
+        return self._view("wind_data")
+
+    # Gibt die Daten als DataFrame zurück (gleiche Spalten wie WeatherHelper.create_dataframe).
+    # Standardmässig ohne Kopie: das DataFrame teilt sich die Arrays mit diesem Objekt, Änderungen am DataFrame
+    # verändern also auch die Spalten. Mit copy=True gehört das DataFrame dem Aufrufer.
+    def to_dataframe(self, copy: bool = False):
+        import pandas as pd
+
+        return pd.DataFrame({column: self.columns[column] for column in self.frame_columns if column in self.columns}, copy=copy)
+
+    def __len__(self):
+        return len(self.columns["date"]) if "date" in self.columns else 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(location_name={self.location_name}, latitude={self.latitude}, longitude={self.longitude}, days={len(self)}, columns={list(self.columns)})"
+
+    # Erzeugt die Einzelobjekte einer Kategorie aus den Spalten (None, wenn die Kategorie fehlt)
+    def _view(self, attribute: str):
+        if attribute in self._view_cache:
+            return self._view_cache[attribute]
+
+        model, mapping = self.views[attribute]
+        if not all(column in self.columns for column in mapping.values()):
+            return None
+
+        count  = len(self)
+        common = {
+            "timestamp": self._to_list(self.columns.get("timestamp"), count),
+            "timezone_offset": self._to_list(self.columns.get("timezone_offset"), count),
+            "date": self._to_list(self.columns.get("date"), count)
+        }
+        values = {field: self._to_list(self.columns[column], count) for field, column in mapping.items()}
+        fields = list(common) + list(values)
+        rows   = zip(*common.values(), *values.values())
+
+        with metrics.stage("build_objects", self.location_name):
+            entries = [model(**dict(zip(fields, row))) for row in rows]
+        self._view_cache[attribute] = entries
+        return entries
+
+    @staticmethod
+    def _to_array(values: list) -> "np.ndarray":
+        import numpy as np
+
+        array = np.asarray(values)
+        # Zeichenketten als object speichern (wie pandas), Datumsobjekte als datetime64
+        if array.dtype.kind in "US":
+            return array.astype(object)
+        if array.dtype.kind == "O" and values and isinstance(values[0], (datetime.date, np.datetime64)):
+            return np.asarray(values, dtype="datetime64[ns]")
+        return array
+
+    @staticmethod
+    def _to_list(column: "np.ndarray", count: int) -> list:
+        if column is None:
+            return [None] * count
+        if column.dtype.kind == "M":
+            import pandas as pd
+            return list(pd.DatetimeIndex(column))
+        return column.tolist()
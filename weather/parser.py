@@ -0,0 +1,181 @@
+import datetime
+from typing import TYPE_CHECKING
+
+from .instrumentation import metrics
+from .models import ColumnarLocationWeatherData, LocationWeatherData, PrecipitationData, TemperatureData, WindData
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+class ForecastParser:
+    # Format der Spalte "date" in API-Daten ("TT.MM.JJJJ"); Aggregate, Analysen, Speicher und Plots lesen es mit to_datetime
+    date_format = "%d.%m.%Y"
+
+    # Zuordnung der Spalten zu den Feldern eines Tages im "daily"-Array (Pfad, Standardwert)
+    daily_fields = {
+        "temp_morning": (("temp", "morn"), None),  # Morgentemperatur
+        "temp_day": (("temp", "day"), None),       # Tagestemperatur
+        "temp_evening": (("temp", "eve"), None),   # Abendtemperatur
+        "temp_night": (("temp", "night"), None),   # Nachttemperatur
+        "temp_min": (("temp", "min"), None),       # Minimaltemperatur
+        "temp_max": (("temp", "max"), None),       # Maximaltemperatur
+        "rain": (("rain",), 0),                    # Regenmenge
+        "snow": (("snow",), 0),                    # Schneemenge
+        "probability": (("pop",), 0),              # Niederschlagswahrscheinlichkeit
+        "wind_speed": (("wind_speed",), 0),        # Windgeschwindigkeit
+        "wind_degrees": (("wind_deg",), 0)         # Windrichtung
+    }
+
+    # Datumswerte als Zeitstempel: Zeichenketten im Format date_format werden umgewandelt, datetime64 (CSV) bleibt
+    @classmethod
+    def to_datetime(cls, dates: "pd.Series | pd.Index", errors: str = "raise") -> "pd.Series | pd.Index":
+        import pandas as pd
+
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
+        return pd.to_datetime(dates, format=cls.date_format, errors=errors)
+
+    # Wandelt eine One Call Antwort spaltenweise in ein ColumnarLocationWeatherData um
+    def parse_daily(self, location_name: str, latitude: float, longitude: float, data: dict) -> ColumnarLocationWeatherData:
+        with metrics.stage("parse", location_name):
+            forecast_data = data.get("daily")
+            offsets       = [data.get("timezone_offset")] * len(forecast_data)
+            columns       = self._parse_columns(forecast_data, offsets)
+            return ColumnarLocationWeatherData(location_name, latitude, longitude, columns)
+
+    # Wandelt viele One Call Antworten in einem Durchgang in ein gemeinsames DataFrame um.
+    # responses enthält Tupel (Standortname, Breite, Länge, Antwort); jede Zeile ist ein Vorhersagetag eines Standorts.
+    def parse_batch(self, responses: list[tuple[str, float, float, dict]]) -> "pd.DataFrame":
+        import numpy as np
+        import pandas as pd
+
+        with metrics.stage("parse_batch"):
+            days       = []
+            offsets    = []
+            names      = []
+            latitudes  = []
+            longitudes = []
+
+            for location_name, latitude, longitude, data in responses:
+                forecast_data = data.get("daily") or []
+                count         = len(forecast_data)
+                days.extend(forecast_data)
+                offsets.extend([data.get("timezone_offset")] * count)
+                names.extend([location_name] * count)
+                latitudes.extend([latitude] * count)
+                longitudes.extend([longitude] * count)
+
+            columns = self._parse_columns(days, offsets)
+
+            frame = pd.DataFrame({
+                "location_name": pd.Categorical(names),
+                "latitude": np.asarray(latitudes, dtype=float),
+                "longitude": np.asarray(longitudes, dtype=float),
+                "timestamp": columns["timestamp"],
+                "timezone_offset": columns["timezone_offset"],
+                **{column: columns[column] for column in ColumnarLocationWeatherData.frame_columns}
+            }, copy=False)
+            return frame
+
+    # Bisheriger objektbasierter Parser (ein Objekt pro Tag und Messgrösse), dient als Referenz
+    def parse_daily_objects(self, location_name: str, latitude: float, longitude: float, data: dict) -> LocationWeatherData:
+        temperature_data   = []
+        precipitation_data = []
+        wind_data          = []
+
+        # Extrahiert für jeden Tag die Vorhersagedaten (8 Tage)
+        forecast_data   = data.get("daily")
+        for forecast_day in forecast_data:
+            timestamp       = forecast_day.get("dt")  # Zeitstempel der Vorhersage
+            timezone_offset = data.get("timezone_offset")  # Zeitzonen-Offset
+
+            # Extrahiert Temperaturdaten
+            temp    = forecast_day.get("temp", {})
+            morning = temp.get("morn")  # Morgentemperatur
+            day     = temp.get("day")   # Tagestemperatur
+            evening = temp.get("eve")   # Abendtemperatur
+            night   = temp.get("night") # Nachttemperatur
+            min     = temp.get("min")   # Minimaltemperatur
+            max     = temp.get("max")   # Maximaltemperatur
+
+            forecast_day_temperature_data = TemperatureData(
+                timestamp,
+                timezone_offset,
+                date=datetime.date.fromtimestamp(timestamp + timezone_offset).strftime(self.date_format),
+                morning=morning,
+                day=day,
+                evening=evening,
+                night=night,
+                min=min,
+                max=max,
+                avg=(morning + day + evening + night) / 4  # Durchschnittstemperatur
+            )
+            temperature_data.append(forecast_day_temperature_data)
+
+            # Extrahiert Niederschlagsdaten
+            rain        = forecast_day.get("rain", 0)  # Regenmenge
+            snow        = forecast_day.get("snow", 0)  # Schneemenge
+            probability = forecast_day.get("pop", 0)  # Niederschlagswahrscheinlichkeit
+
+            forecast_day_precipitation_data = PrecipitationData(
+                timestamp,
+                timezone_offset,
+                date=datetime.date.fromtimestamp(timestamp + timezone_offset).strftime(self.date_format),
+                rain=rain,
+                snow=snow,
+                probability=probability
+            )
+            precipitation_data.append(forecast_day_precipitation_data)
+
+            # Extrahiert Winddaten
+            speed   = forecast_day.get("wind_speed", 0)  # Windgeschwindigkeit
+            degrees = forecast_day.get("wind_deg", 0)  # Windrichtung
+
+            wd = WindData(
+                timestamp,
+                timezone_offset,
+                date=datetime.date.fromtimestamp(timestamp + timezone_offset).strftime(self.date_format),
+                speed=speed,
+                degrees=degrees
+            )
+            wind_data.append(wd)
+
+        # Erstellt ein LocationWeatherData-Objekt, um die Wetterdaten zu speichern
+        location_weather_data = LocationWeatherData(
+            location_name,
+            latitude,
+            longitude,
+            temperature_data,
+            precipitation_data,
+            wind_data
+        )
+
+        return location_weather_data
+
+    # Extrahiert alle Felder spaltenweise; Datumswerte werden nur einmal pro eindeutigem Zeitpunkt umgerechnet
+    def _parse_columns(self, forecast_days: list[dict], offsets: list[int]) -> dict[str, "np.ndarray"]:
+        import numpy as np
+
+        columns = {
+            "timestamp": np.asarray([forecast_day.get("dt") for forecast_day in forecast_days]),
+            "timezone_offset": np.asarray(offsets)
+        }
+
+        temperatures = [forecast_day.get("temp", {}) for forecast_day in forecast_days]
+        for column, (path, default) in self.daily_fields.items():
+            if path[0] == "temp":
+                values = [temp.get(path[1]) for temp in temperatures]
+            else:
+                values = [forecast_day.get(path[0], default) for forecast_day in forecast_days]
+            columns[column] = np.asarray(values)
+
+        # Durchschnittstemperatur
+        columns["temp_avg"] = (columns["temp_morning"] + columns["temp_day"] + columns["temp_evening"] + columns["temp_night"]) / 4
+
+        # Lokales Datum wie datetime.date.fromtimestamp, aber je eindeutiger Sekunde nur einmal berechnet
+        unique, inverse = np.unique(columns["timestamp"] + columns["timezone_offset"], return_inverse=True)
+        unique_dates    = np.asarray([datetime.date.fromtimestamp(seconds).strftime(self.date_format) for seconds in unique.tolist()], dtype=object)
+        columns["date"] = unique_dates[inverse]
+
+        return columns
@@ -1,116 +1,284 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
+from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+from matplotlib.figure import Figure
+
+from .aggregates import AggregateCube
+from .downsample import Downsampler
+from .instrumentation import metrics
+from .parser import ForecastParser
 
 class WeatherPlotter:
+    # Plots, die statt der Rohdaten auch einen AggregateCube akzeptieren, und die dafür benötigten Messgrössen
+    aggregate_plots    = ("plot_total_rain", "plot_total_snow", "plot_combined_heatmap", "plot_city_heatmaps")
+    aggregate_measures = ("temp_avg", "rain", "snow")
+
+    # Ohne output_dir werden die Plots wie bisher interaktiv angezeigt (plt.show).
+    # Mit output_dir läuft der Plotter headless: Figuren werden ohne pyplot (Agg) erzeugt, als Datei
+    # (file_format "png" oder "svg") gespeichert und zwischen den Plots wiederverwendet.
+    # Zeitreihen mit mehr Punkten, als die Figur darstellen kann, werden vom downsampler reduziert (None: aus).
+    def __init__(self, output_dir: str = None, file_format: str = "png", dpi: int = 100, prefix: str = "", downsampler: Downsampler | None = Downsampler()):
+        self.output_dir  = output_dir
+        self.file_format = file_format
+        self.dpi         = dpi
+        self.prefix      = prefix
+        self.downsampler = downsampler
+        self.saved_files = []
+        self._figures    = {}
+
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+
+    # Erstellt eine Figur und Achsen für das Plotten (headless: bestehende Figur gleicher Grösse wiederverwenden)
+    def _setup_figure_and_axes(self, figsize=(12, 6)):
+        if self.output_dir is None:
+            return plt.subplots(figsize=figsize)
+
+        fig = self._figures.get(figsize)
+        if fig is None:
+            fig = Figure(figsize=figsize, dpi=self.dpi)
+            self._figures[figsize] = fig
+        else:
+            fig.clear()
+        return fig, fig.add_subplot()
+
+    # Zeigt die Figur an bzw. speichert sie im Headless-Modus unter output_dir/<prefix><name>.<file_format>
+    def _finish_figure(self, fig, name: str):
+        fig.tight_layout()
+        if self.output_dir is None:
+            plt.show()
+            return
+
+        path = os.path.join(self.output_dir, f"{self._slug(self.prefix + name)}.{self.file_format}")
+        with metrics.stage("render"):
+            fig.savefig(path, format=self.file_format)
+        fig.clear()
+        self.saved_files.append(path)
+
+    # Gibt alle wiederverwendeten Figuren frei
+    def close(self):
+        for fig in self._figures.values():
+            fig.clear()
+        self._figures.clear()
+
+    def __enter__(self):
+        return self
 
-    # Erstellt eine Figur und Achsen für das Plotten
-    def _setup_figure_and_axes(self):
-        return plt.subplots(figsize=(12, 6))
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     # Legt gemeinsame Eigenschaften für Achsen fest (Titel, Beschriftungen, Gitter, Legende)
-    def _set_common_axis_properties(self, ax, title, xlabel, ylabel, xlabels, xlabel_pos=None):
+    def _set_common_axis_properties(self, ax, title, xlabel, ylabel, xlabels, xlabel_pos=None, name: str = None):
         ax.set_title(title, fontweight='bold', pad=15)
         ax.set_xlabel(xlabel, fontweight='bold')
         ax.set_ylabel(ylabel, fontweight='bold')
-        if xlabel_pos is not None:
-            ax.set_xticks(xlabel_pos)
-        else:
-            ax.set_xticks(xlabels)
-        ax.set_xticklabels(xlabels, rotation=90, ha='center')
+        self._set_xticks(ax, xlabels, xlabel_pos)
         ax.grid(axis="both", linestyle='--', color='gray')
         ax.legend(loc="center left", bbox_to_anchor=(1, 0.5))
-        plt.tight_layout()
-        plt.show()
+        self._finish_figure(ax.figure, name or title)
+
+    # Setzt die x-Beschriftungen: eine pro Datum, bei langen Zeiträumen nur so viele, wie lesbar sind
+    def _set_xticks(self, ax, xlabels, xlabel_pos=None):
+        positions = xlabel_pos if xlabel_pos is not None else xlabels
+        budget    = self.downsampler.tick_budget(ax) if self.downsampler is not None else len(positions)
+
+        if len(positions) > budget and xlabel_pos is None and pd.api.types.is_datetime64_any_dtype(positions):
+            # Zeitachse: matplotlib wählt sinnvolle Abstände (Tage, Monate, Jahre)
+            locator = AutoDateLocator(maxticks=budget)
+            ax.xaxis.set_major_locator(locator)
+            ax.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+            return
+
+        if len(positions) > budget:
+            positions, xlabels = self.downsampler.tick_subset(positions, xlabels, budget)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(xlabels, rotation=90, ha='center')
 
     # Gibt gemeinsame Datumswerte aus den Standortdaten zurück
     def _get_common_dates(self, location_data):
         return next(iter(location_data.values()))["date"]
 
+    # Reduziert die Standortdaten auf das Punktbudget der Achse (Linien/Punkte: column, Bereiche: low und high).
+    # Sind alle Standorte klein genug, bleiben die Daten unverändert; sonst liegen alle Datumswerte als Zeitstempel vor.
+    # Gibt die (reduzierten) Standortdaten, die Datumswerte für die Achse und den passenden Marker zurück.
+    def _reduce(self, ax, location_data, column=None, low=None, high=None):
+        dates = self._get_common_dates(location_data)
+        if self.downsampler is None:
+            return location_data, dates, "o"
+
+        budget  = self.downsampler.point_budget(ax)
+        longest = max(len(df) for df in location_data.values())
+        marker  = "o" if longest <= budget // 4 else None
+        if longest <= budget:
+            return location_data, dates, marker
+
+        reduced = {}
+        for loc, df in location_data.items():
+            if column is not None:
+                df = self.downsampler.reduce(df, column, budget)
+            else:
+                df = self.downsampler.reduce_range(df, low, high, budget)
+            reduced[loc] = df.assign(date=ForecastParser.to_datetime(df["date"]))
+        return reduced, ForecastParser.to_datetime(dates), marker
+
+    # Gibt die Aggregate zu den Standortdaten zurück. Ein bereits aufgebauter AggregateCube wird direkt verwendet;
+    # aus Rohdaten werden nur die Monatswerte der benötigten Messgrösse berechnet (z. B. "temp_avg" für Heatmaps).
+    def _aggregates(self, location_data, measure: str) -> AggregateCube:
+        if isinstance(location_data, AggregateCube):
+            return location_data
+        return AggregateCube.from_location_data(location_data, (measure,), daily=False)
+
     # Erstellt ein Balkendiagramm für Gesamtwerte (z. B. Niederschlag, Schnee)
     def _plot_total_value(self, location_data, column, title, ylabel, color):
         fig, ax = self._setup_figure_and_axes()
-        locations = list(location_data.keys())
-        totals = [df[column].sum() for df in location_data.values()]
-        ax.bar(locations, totals, color=color)
+        if isinstance(location_data, AggregateCube):
+            totals = location_data.totals(column)
+        else:
+            # Rohdaten: nur die benötigte Spalte summieren, ohne Aggregate aufzubauen
+            totals = pd.Series({location: df[column].sum() for location, df in location_data.items()}, dtype=float)
+        ax.bar(list(totals.index), totals.to_numpy(), color=color)
         ax.set_title(title, fontweight='bold', pad=15)
         ax.set_xlabel("Location", fontweight='bold')
         ax.set_ylabel(ylabel, fontweight='bold')
         ax.grid(axis="y", linestyle='--', color='gray')
-        plt.tight_layout()
-        plt.show()
+        self._finish_figure(fig, f"total_{column}")
 
     # Plottet Temperaturen für eine bestimmte Tageszeit
     def plot_temperatures_by_time_of_day(self, location_data: dict[str, pd.DataFrame], time_of_day: str):
         fig, ax = self._setup_figure_and_axes()
+        column  = f"temp_{time_of_day}"
+        location_data, dates, marker = self._reduce(ax, location_data, column)
         for loc, df in location_data.items():
-            ax.plot(df["date"], df[f"temp_{time_of_day}"], marker="o", label=loc)
-        dates = self._get_common_dates(location_data)
-        self._set_common_axis_properties(ax, f"Temperatures {time_of_day.capitalize()}", "Date", "Temperature (°C)", dates)
+            ax.plot(df["date"], df[column], marker=marker, label=loc)
+        self._set_common_axis_properties(ax, f"Temperatures {time_of_day.capitalize()}", "Date", "Temperature (°C)", dates, name=f"temperatures_{time_of_day}")
 
     # Plottet den Bereich zwischen minimalen und maximalen Temperaturen
     def plot_min_max_temperatures(self, location_data: dict[str, pd.DataFrame], xlabels: list[str] = None):
         fig, ax = self._setup_figure_and_axes()
+        location_data, dates, _ = self._reduce(ax, location_data, low="temp_min", high="temp_max")
         for loc, df in location_data.items():
             ax.fill_between(df["date"], df["temp_min"], df["temp_max"], alpha=0.3, label=loc)
-        dates = self._get_common_dates(location_data)
         if xlabels is not None:
-            self._set_common_axis_properties(ax, "Temperature Ranges", "Date", "Temperature (°C)", xlabels, dates)
+            self._set_common_axis_properties(ax, "Temperature Ranges", "Date", "Temperature (°C)", xlabels, dates, name="temperature_ranges")
         else:
-            self._set_common_axis_properties(ax, "Temperature Ranges", "Date", "Temperature (°C)", dates)
+            self._set_common_axis_properties(ax, "Temperature Ranges", "Date", "Temperature (°C)", dates, name="temperature_ranges")
 
     # Plottet die Durchschnittstemperaturen
     def plot_avg_temperatures(self, location_data: dict[str, pd.DataFrame]):
         fig, ax = self._setup_figure_and_axes()
+        location_data, dates, marker = self._reduce(ax, location_data, "temp_avg")
         for loc, df in location_data.items():
-            ax.plot(df["date"], df["temp_avg"], marker="o", label=loc)
-        dates = self._get_common_dates(location_data)
-        self._set_common_axis_properties(ax, "Average Temperatures", "Date", "Temperature (°C)", dates)
+            ax.plot(df["date"], df["temp_avg"], marker=marker, label=loc)
+        self._set_common_axis_properties(ax, "Average Temperatures", "Date", "Temperature (°C)", dates, name="average_temperatures")
 
     # Plottet die Windgeschwindigkeit
     def plot_wind_speed(self, location_data: dict[str, pd.DataFrame]):
         fig, ax = self._setup_figure_and_axes()
+        location_data, dates, _ = self._reduce(ax, location_data, "wind_speed")
         for loc, df in location_data.items():
             ax.scatter(df["date"], df["wind_speed"], alpha=0.7, label=loc)
-        dates = self._get_common_dates(location_data)
-        self._set_common_axis_properties(ax, "Wind Speeds", "Date", "Wind Speeds (km/h)", dates)
+        self._set_common_axis_properties(ax, "Wind Speeds", "Date", "Wind Speeds (km/h)", dates, name="wind_speeds")
 
     # Plottet den Gesamtniederschlag für jeden Standort
-    def plot_total_rain(self, location_data: dict[str, pd.DataFrame]):
+    def plot_total_rain(self, location_data: dict[str, pd.DataFrame] | AggregateCube):
         self._plot_total_value(location_data, "rain", "Total Rain", "Total (mm)", color='skyblue')
 
     # Plottet den Gesamtschneefall für jeden Standort
-    def plot_total_snow(self, location_data: dict[str, pd.DataFrame]):
+    def plot_total_snow(self, location_data: dict[str, pd.DataFrame] | AggregateCube):
         self._plot_total_value(location_data, "snow", "Total Snow", "Total (mm)", color='ivory')
 
 
     # Plottet die Heatmap für die Durchschnittstemperaturen
-    def plot_combined_heatmap(self, df: dict[str, pd.DataFrame]) -> None:
-        locations   = ", ".join(df.keys())
-        combined_df = pd.concat([data.assign(location=loc) for loc, data in df.items()], ignore_index=True)
-        combined_df["location_date"] = combined_df['location'] + " " + combined_df['year'].astype(str)
-        pivot_table = combined_df.pivot_table(values="temp_avg", index="location_date", columns="month")
-
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(pivot_table, annot=True, fmt=".1f", cmap="coolwarm")
-        plt.title(f"Monatliche Durchschnittstemperaturen {locations}")
-        plt.xlabel("Monat")
-        plt.ylabel("Stadt & Jahr")
-        plt.tight_layout()
-        plt.show()
-
-    # Plottet die monatlichen Durchschnittstemperaturen für jeden Standort
-    def plot_city_heatmap(self, location_name: str, location_dataframe: pd.DataFrame) -> None:
-        location_dataframe["date"]  = pd.to_datetime(location_dataframe["date"])
-        location_dataframe["year"]  = location_dataframe["date"].dt.year
-        location_dataframe["month"] = location_dataframe["date"].dt.month
-
-        pivot_table = location_dataframe.pivot_table(values="temp_avg", index="year", columns="month")
-
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(pivot_table, annot=True, fmt=".1f", cmap="coolwarm")
-        plt.title(f'Monatliche Durchschnittstemperaturen in {location_name} (°C)')
-        plt.xlabel('Monat')
-        plt.ylabel('Jahr')
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+    def plot_combined_heatmap(self, df: dict[str, pd.DataFrame] | AggregateCube) -> None:
+        cube        = self._aggregates(df, "temp_avg")
+        locations   = ", ".join(cube.locations())
+        pivot_table = cube.monthly("temp_avg")
+        pivot_table.index = [f"{location} {year}" for location, year in pivot_table.index]
+        pivot_table = pivot_table.sort_index().rename_axis("location_date")
+
+        fig, ax = self._setup_figure_and_axes(figsize=(12, 8))
+        sns.heatmap(pivot_table, annot=True, fmt=".1f", cmap="coolwarm", ax=ax)
+        ax.set_title(f"Monatliche Durchschnittstemperaturen {locations}")
+        ax.set_xlabel("Monat")
+        ax.set_ylabel("Stadt & Jahr")
+        self._finish_figure(fig, "combined_heatmap")
+
+    # Plottet die monatlichen Durchschnittstemperaturen für einen Standort (DataFrame oder AggregateCube mit dem Standort)
+    def plot_city_heatmap(self, location_name: str, location_dataframe: pd.DataFrame | AggregateCube) -> None:
+        if not isinstance(location_dataframe, AggregateCube):
+            location_dataframe = {location_name: location_dataframe}
+        pivot_table = self._aggregates(location_dataframe, "temp_avg").monthly("temp_avg", locations=[location_name]).droplevel("location")
+
+        fig, ax = self._setup_figure_and_axes(figsize=(10, 6))
+        sns.heatmap(pivot_table, annot=True, fmt=".1f", cmap="coolwarm", ax=ax)
+        ax.set_title(f'Monatliche Durchschnittstemperaturen in {location_name} (°C)')
+        ax.set_xlabel('Monat')
+        ax.set_ylabel('Jahr')
+        self._finish_figure(fig, f"city_heatmap_{location_name}")
+
+    # Rendert für mehrere Standort-Gruppen ({Gruppenname: location_data}) alle Plots headless als Dateien.
+    # Jede Gruppe wird in einem eigenen Prozess gerendert; plots ist eine Liste von (Methodenname, Argumente),
+    # ohne Angabe werden passende Standard-Plots für API- bzw. CSV-Daten gewählt. Gibt die erzeugten Dateien zurück.
+    @staticmethod
+    def export_batch(
+        batches: dict[str, dict[str, pd.DataFrame]],
+        output_dir: str,
+        plots: list[tuple[str, dict]] = None,
+        file_format: str = "png",
+        dpi: int = 100,
+        max_workers: int = None
+    ) -> list[str]:
+        tasks = [(output_dir, file_format, dpi, f"{batch_name}_", location_data, plots) for batch_name, location_data in batches.items()]
+        if max_workers == 1:
+            results = [_render_batch(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_render_batch, *zip(*tasks)))
+        return [path for paths in results for path in paths]
+
+    # Wählt die Standard-Plots passend zu den vorhandenen Spalten
+    @staticmethod
+    def default_plots(location_data: dict[str, pd.DataFrame]) -> list[tuple[str, dict]]:
+        columns = next(iter(location_data.values())).columns
+        if "wind_speed" in columns:
+            return [
+                *[("plot_temperatures_by_time_of_day", {"time_of_day": time_of_day}) for time_of_day in ("morning", "day", "evening", "night")],
+                ("plot_min_max_temperatures", {}),
+                ("plot_avg_temperatures", {}),
+                ("plot_wind_speed", {}),
+                ("plot_total_rain", {}),
+                ("plot_total_snow", {})
+            ]
+        return [
+            ("plot_min_max_temperatures", {}),
+            ("plot_city_heatmaps", {}),
+            ("plot_combined_heatmap", {})
+        ]
+
+    # Plottet die Heatmap jedes Standorts (die Aggregate werden dafür nur einmal berechnet)
+    def plot_city_heatmaps(self, location_data: dict[str, pd.DataFrame] | AggregateCube) -> None:
+        cube = self._aggregates(location_data, "temp_avg")
+        for location_name in cube.locations():
+            self.plot_city_heatmap(location_name, cube)
+
+    @staticmethod
+    def _slug(name: str) -> str:
+        return re.sub(r"[^\w.-]+", "_", name, flags=re.UNICODE).strip("_")
+
+
+# Wird im Worker-Prozess ausgeführt: rendert alle Plots einer Gruppe und gibt die Dateipfade zurück
+def _render_batch(output_dir: str, file_format: str, dpi: int, prefix: str, location_data: dict[str, pd.DataFrame], plots: list[tuple[str, dict]] = None) -> list[str]:
+    cube = None
+    with WeatherPlotter(output_dir, file_format, dpi, prefix) as plotter:
+        for method_name, kwargs in plots or WeatherPlotter.default_plots(location_data):
+            if method_name in WeatherPlotter.aggregate_plots:
+                # Heatmaps und Summen teilen sich die einmal berechneten Aggregate
+                cube = cube if cube is not None else AggregateCube.from_location_data(location_data, WeatherPlotter.aggregate_measures, daily=False)
+                getattr(plotter, method_name)(cube, **kwargs)
+            else:
+                getattr(plotter, method_name)(location_data, **kwargs)
+        return plotter.saved_files
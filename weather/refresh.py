@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import AggregateCube
+from .fetcher import WeatherClient
+from .parser import ForecastParser
+from .storage import WeatherStore
+
+logger = logging.getLogger(__name__)
+
+# Inkrementelle Aktualisierung der gespeicherten Vorhersagen.
+# Pro Standort wird der zuletzt übernommene Zeitstempel (inkl. Zeitzonen-Offset) gemerkt; bei jedem Lauf werden nur
+# neue Tage angehängt und geänderte Tage überschrieben. Jede neue bzw. geänderte Version eines Tages wird zusätzlich
+# mit ihrem Ausgabezeitpunkt ("issued_at") in der Historie abgelegt, sodass sich die Entwicklung einer Vorhersage
+# nachvollziehen lässt, ohne vollständige Schnappschüsse zu speichern.
+# Mit cube werden die Aggregate für Heatmaps und Summen laufend mitgeführt.
+class IncrementalRefresher:
+    state_file = "_refresh_state.json"  # "_" am Anfang: wird beim Lesen des Datasets ignoriert
+
+    def __init__(self, fetcher: WeatherClient, store: WeatherStore, history: WeatherStore = None, cube: AggregateCube = None):
+        self.fetcher = fetcher
+        self.store   = store
+        self.cube    = cube
+        self.history = history if history is not None else WeatherStore(os.path.join(store.root, "_history"), store.file_format)
+        self._lock   = threading.Lock()
+        self.state   = self._load_state()
+
+    # Ruft die Vorhersagen ab und übernimmt nur neue oder geänderte Tage.
+    # Gibt pro Standort die Anzahl neuer, geänderter und unveränderter Tage zurück (None, wenn Abruf oder Übernahme
+    # fehlschlugen; die übrigen Standorte und der gemerkte Stand sind davon nicht betroffen).
+    def refresh(self, locations: list[dict], max_concurrency: int = 8, issued_at: pd.Timestamp = None) -> dict[str, dict | None]:
+        issued_at = pd.Timestamp(issued_at) if issued_at is not None else pd.Timestamp.now("UTC").tz_localize(None)
+        responses = self.fetcher.fetch_forecast_payloads(locations, max_concurrency)
+
+        summary = {}
+        for location, response in zip(locations, responses):
+            if response is None:
+                summary[location["name"]] = None
+                continue
+            try:
+                summary[location["name"]] = self._apply(*response, issued_at=issued_at)
+            except Exception as e:
+                logger.error("Aktualisierung von %s fehlgeschlagen: %s", location["name"], e, extra={"location": location["name"]})
+                summary[location["name"]] = None
+
+        self._save_state()
+        return summary
+
+    # Übernimmt eine bereits geladene One Call Antwort für einen Standort
+    def apply(self, location_name: str, latitude: float, longitude: float, data: dict, issued_at: pd.Timestamp = None) -> dict:
+        issued_at = pd.Timestamp(issued_at) if issued_at is not None else pd.Timestamp.now("UTC").tz_localize(None)
+        result    = self._apply(location_name, latitude, longitude, data, issued_at)
+        self._save_state()
+        return result
+
+    def _apply(self, location_name: str, latitude: float, longitude: float, data: dict, issued_at: pd.Timestamp) -> dict:
+        forecast = self.fetcher.parser.parse_daily(location_name, latitude, longitude, data)
+        frame    = forecast.to_dataframe()
+        frame.insert(1, "timestamp", forecast.columns["timestamp"])
+        frame.insert(2, "timezone_offset", forecast.columns["timezone_offset"])
+
+        with self._lock:
+            last = self.state.get(location_name, {}).get("timestamp")
+
+        # Tage nach dem letzten übernommenen Zeitstempel sind sicher neu; nur die übrigen mit dem Speicher vergleichen
+        is_new   = frame["timestamp"] > last if last is not None else pd.Series(True, index=frame.index)
+        existing = frame[~is_new]
+        changed  = self._changed_rows(location_name, existing) if not existing.empty else np.zeros(0, dtype=bool)
+
+        updates = pd.concat([frame[is_new], existing[changed]]).sort_values("timestamp")
+        if not updates.empty:
+            self.store.write(location_name, updates)
+            self.history.write(location_name, updates.assign(issued_at=issued_at), key=["date", "issued_at"])
+            self._update_cube(location_name, frame[is_new], changed.any())
+
+        with self._lock:
+            latest = frame.loc[frame["timestamp"].idxmax()]
+            if last is None or latest["timestamp"] >= last:
+                self.state[location_name] = {
+                    "timestamp": int(latest["timestamp"]),
+                    "timezone_offset": int(latest["timezone_offset"]),
+                    "issued_at": issued_at.isoformat()
+                }
+
+        return {"new": int(is_new.sum()), "changed": int(changed.sum()), "unchanged": int(len(existing) - changed.sum())}
+
+    # Alle gespeicherten Versionen der Vorhersage (optional nur für einen Tag), sortiert nach Ausgabezeitpunkt
+    def forecast_history(self, location_name: str, date: str = None) -> pd.DataFrame:
+        location_data = self.history.read_locations([location_name], start=self._parse_date(date), end=self._parse_date(date))
+        if location_name not in location_data:
+            return pd.DataFrame()
+        return location_data[location_name].sort_values(["timestamp", "issued_at"]).reset_index(drop=True)
+
+    # Neue Tage werden eingerechnet; bei geänderten Tagen wird der Standort aus dem Speicher neu aggregiert
+    def _update_cube(self, location_name: str, new_rows: pd.DataFrame, has_changes: bool):
+        if self.cube is None:
+            return
+        if has_changes or location_name not in self.cube:
+            stored = self.store.read_locations([location_name]).get(location_name)
+            if stored is not None:
+                self.cube.replace(location_name, stored)
+        else:
+            self.cube.add(location_name, new_rows)
+
+    # Vergleicht die Tage mit dem gespeicherten Stand (nur der betroffene Zeitraum wird gelesen)
+    def _changed_rows(self, location_name: str, frame: pd.DataFrame) -> np.ndarray:
+        dates  = ForecastParser.to_datetime(frame["date"])
+        stored = self.store.read_locations([location_name], start=dates.min(), end=dates.max()).get(location_name)
+        if stored is None:
+            return np.ones(len(frame), dtype=bool)
+
+        merged  = frame.merge(stored, on="date", how="left", suffixes=("", "_stored"), indicator=True)
+        changed = (merged["_merge"] == "left_only").to_numpy()
+
+        for column in frame.columns:
+            if column == "date" or f"{column}_stored" not in merged:
+                continue
+            new, old = merged[column], merged[f"{column}_stored"]
+            changed |= ~((new == old) | (new.isna() & old.isna())).to_numpy()
+
+        return changed
+
+    def _parse_date(self, date: str | None) -> pd.Timestamp | None:
+        if date is None:
+            return None
+        return pd.to_datetime(date, format=ForecastParser.date_format)
+
+    def _load_state(self) -> dict:
+        path = os.path.join(self.store.root, self.state_file)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def _save_state(self):
+        path      = os.path.join(self.store.root, self.state_file)
+        temporary = f"{path}.tmp"
+        with self._lock:
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump(self.state, file, ensure_ascii=False, indent=2)
+        os.replace(temporary, path)
@@ -0,0 +1,164 @@
+import random
+import threading
+import time
+
+import requests
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+# Token Bucket: höchstens capacity Anfragen am Stück, danach rate Anfragen pro Sekunde
+class TokenBucket:
+    def __init__(self, capacity: float, rate: float, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate     = rate
+        self.tokens   = capacity
+        self._clock   = clock
+        self._updated = clock()
+        self._lock    = threading.Lock()
+
+    # Reserviert ein Token und gibt zurück, wie viele Sekunden bis zu dessen Verfügbarkeit gewartet werden muss
+    def reserve(self) -> float:
+        with self._lock:
+            now           = self._clock()
+            self.tokens   = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens  -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    # Gibt ein reserviertes Token zurück (z. B. wenn die Wartezeit zu lang wäre)
+    def release(self):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+
+# Plant Anfragen an die OpenWeatherMap-Endpunkte unter Berücksichtigung des API-Kontingents.
+# Pro API-Schlüssel gibt es je einen Token Bucket für Anfragen pro Minute und (optional) pro Tag.
+# Antworten mit einem Statuscode aus retry_statuses sowie Verbindungsfehler werden mit exponentiellem Backoff
+# und zufälligem Jitter wiederholt; ein "Retry-After"-Header des Servers hat Vorrang.
+# sleep und clock lassen sich ersetzen, z. B. durch eine simulierte Uhr in Tests.
+class RequestScheduler:
+    def __init__(
+        self,
+        calls_per_minute: float | None = 60,
+        calls_per_day: float | None = None,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        max_wait: float | None = None,
+        retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        sleep=time.sleep,
+        clock=time.monotonic
+    ):
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_day    = calls_per_day
+        self.max_retries      = max_retries
+        self.backoff_base     = backoff_base
+        self.backoff_max      = backoff_max
+        self.max_wait         = max_wait
+        self.retry_statuses   = set(retry_statuses)
+        self._sleep           = sleep
+        self._clock           = clock
+        self._buckets         = {}
+        self._lock            = threading.Lock()
+
+        self.requests        = 0
+        self.retries         = 0
+        self.throttled       = 0  # Anzahl 429-Antworten
+        self.queue_depth     = 0  # Aktuell auf ein Token wartende Anfragen
+        self.max_queue_depth = 0
+        self.wait_time       = 0.0  # Summe der Wartezeiten durch das Kontingent (Sekunden)
+        self.backoff_time    = 0.0  # Summe der Wartezeiten durch Wiederholungen (Sekunden)
+
+    # Führt eine GET-Anfrage aus; gibt die letzte Antwort zurück (Fehlerstatus prüft der Aufrufer)
+    def request(self, session: requests.Session, url: str, params: dict, timeout: float = None) -> requests.Response:
+        buckets = self._buckets_for(params.get("appid"))
+
+        for attempt in range(self.max_retries + 1):
+            self._acquire(buckets)
+
+            try:
+                response = session.get(url, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._backoff(attempt)
+                continue
+            finally:
+                self._record(sent=1)
+
+            if response.status_code not in self.retry_statuses or attempt == self.max_retries:
+                return response
+
+            if response.status_code == 429:
+                self._record(throttled=1)
+            self._backoff(attempt, response.headers.get("Retry-After"))
+
+        return response
+
+    # Gibt die Kennzahlen des Schedulers zurück
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "wait_time": self.wait_time,
+                "backoff_time": self.backoff_time
+            }
+
+    def _buckets_for(self, api_key: str | None) -> list[TokenBucket]:
+        with self._lock:
+            if api_key not in self._buckets:
+                buckets = []
+                if self.calls_per_minute:
+                    buckets.append(TokenBucket(self.calls_per_minute, self.calls_per_minute / 60, self._clock))
+                if self.calls_per_day:
+                    buckets.append(TokenBucket(self.calls_per_day, self.calls_per_day / 86400, self._clock))
+                self._buckets[api_key] = buckets
+            return self._buckets[api_key]
+
+    # Wartet, bis alle Buckets des Schlüssels ein Token freigeben
+    def _acquire(self, buckets: list[TokenBucket]):
+        delay = max((bucket.reserve() for bucket in buckets), default=0.0)
+
+        if self.max_wait is not None and delay > self.max_wait:
+            for bucket in buckets:
+                bucket.release()
+            raise RateLimitExceeded(f"API-Kontingent erschöpft: nächste Anfrage erst in {delay:.0f} Sekunden möglich.")
+
+        if delay <= 0:
+            return
+
+        with self._lock:
+            self.queue_depth    += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            self._sleep(delay)
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+                self.wait_time   += delay
+
+    # Exponentielles Backoff mit vollem Jitter: zufällige Wartezeit zwischen 0 und min(backoff_max, base * 2^attempt)
+    def _backoff(self, attempt: int, retry_after: str = None):
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+            except ValueError:
+                pass
+
+        self._record(retries=1, backoff_time=delay)
+        self._sleep(delay)
+
+    def _record(self, sent: int = 0, retries: int = 0, throttled: int = 0, backoff_time: float = 0.0):
+        with self._lock:
+            self.requests     += sent
+            self.retries      += retries
+            self.throttled    += throttled
+            self.backoff_time += backoff_time
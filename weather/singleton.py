@@ -1,7 +1,17 @@
+import threading
+
+
+# Eine Instanz pro Klasse und Prozess. Erstellen ist threadsicher (doppelt geprüft unter _singleton_lock);
+# Unterklassen schützen ihre einmalige Initialisierung in __init__ mit derselben Sperre.
 class Singleton:
-    _instances = {}
+    _instances      = {}
+    _singleton_lock = threading.RLock()
 
     def __new__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__new__(cls)
-        return cls._instances[cls]
\ No newline at end of file
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with cls._singleton_lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = cls._instances[cls] = super().__new__(cls)
+        return instance
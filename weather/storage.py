@@ -0,0 +1,204 @@
+import datetime
+import os
+from urllib.parse import quote
+
+import pandas as pd
+
+from .parser import ForecastParser
+
+
+# Spaltenbasierter Speicher für Wetterdaten (Parquet oder Arrow IPC), partitioniert nach Standort und Jahr:
+#   <root>/location=<Standort>/year=<Jahr>/data.parquet
+# Die Spalte "date" wird einheitlich als Zeitstempel gespeichert; das ursprüngliche Format (z. B. "TT.MM.JJJJ" der API)
+# steht in "date_format" und wird von read_locations wiederhergestellt.
+# Gelesen wird über pyarrow.dataset mit Memory-Mapping; Filter auf Standort und Datumsbereich werden an die
+# Partitionen und Row Groups weitergereicht, sodass nur die benötigten Ausschnitte geladen werden.
+class WeatherStore:
+    formats = {"parquet": "parquet", "ipc": "arrow"}
+
+    def __init__(self, root: str = "data/store", file_format: str = "parquet"):
+        if file_format not in self.formats:
+            raise ValueError(f"Unbekanntes Format '{file_format}'. Erlaubt sind: {', '.join(self.formats)}.")
+
+        self.root        = root
+        self.file_format = file_format
+        os.makedirs(root, exist_ok=True)
+
+    # Speichert das DataFrame eines Standorts (aus create_dataframe oder get_weather_data_from_csv).
+    # Bereits gespeicherte Tage werden überschrieben (Upsert auf das Datum), neue Tage angehängt.
+    # Mit key lässt sich der Upsert-Schlüssel erweitern (z. B. ["date", "issued_at"] für eine Versionshistorie).
+    def write(self, location_name: str, df: pd.DataFrame, key: list[str] = None):
+        if df.empty:
+            return
+
+        df = df.copy()
+        df["date_format"] = None if pd.api.types.is_datetime64_any_dtype(df["date"]) else ForecastParser.date_format
+        df["date"]        = ForecastParser.to_datetime(df["date"]).astype("datetime64[ns]")
+
+        for year, part in df.groupby(df["date"].dt.year, sort=True):
+            path     = self._partition_path(location_name, int(year))
+            existing = self._read_file(path) if os.path.exists(path) else None
+
+            if existing is not None:
+                part = pd.concat([existing, part], ignore_index=True)
+                part = part.drop_duplicates(subset=key or ["date"], keep="last")
+
+            self._write_file(path, part.sort_values(key or ["date"]).reset_index(drop=True))
+
+    # Speichert mehrere Standorte ({Standortname: DataFrame}, z. B. location_data aus den Notebooks)
+    def write_many(self, location_data: dict[str, pd.DataFrame]):
+        for location_name, df in location_data.items():
+            self.write(location_name, df)
+
+    # Liest die gespeicherten Daten aller (bzw. der angegebenen) Standorte als ein DataFrame mit Spalte "location"
+    # und "date" als Zeitstempel. start und end (inklusive) schränken die gelesenen Partitionen und Zeilen ein.
+    def read(
+        self,
+        locations: list[str] = None,
+        start: datetime.date | str = None,
+        end: datetime.date | str = None,
+        columns: list[str] = None
+    ) -> pd.DataFrame:
+        import pyarrow.dataset as ds
+
+        dataset = self._dataset()
+        if dataset is None:
+            return pd.DataFrame()
+
+        expression = None
+        if locations is not None:
+            expression = ds.field("location").isin(list(locations))
+
+        if columns is not None:
+            columns = ["location", *columns]
+
+        df = self._scan(dataset, expression, start, end, columns)
+        if df.empty:
+            return df
+
+        df["location"] = df["location"].astype(str)
+        df = df[["location", *[column for column in df.columns if column != "location"]]]
+        return df.sort_values(["location", "date"], kind="stable").reset_index(drop=True)
+
+    # Liest die Daten im Format der Plotter ({Standortname: DataFrame}). Jeder Standort wird aus seinen eigenen
+    # Partitionen gelesen, sodass Spalten und Datentypen sowie das ursprüngliche Datumsformat erhalten bleiben.
+    def read_locations(
+        self,
+        locations: list[str] = None,
+        start: datetime.date | str = None,
+        end: datetime.date | str = None,
+        columns: list[str] = None
+    ) -> dict[str, pd.DataFrame]:
+        if columns is not None:
+            columns = [*columns, "date_format"]
+
+        location_data = {}
+        for location_name in (locations if locations is not None else self.locations()):
+            dataset = self._dataset(location_name)
+            if dataset is None:
+                continue
+
+            df = self._scan(dataset, None, start, end, columns)
+            if df.empty:
+                continue
+
+            df          = df.sort_values("date", kind="stable").reset_index(drop=True)
+            date_format = df.pop("date_format").iat[0]
+            if date_format is not None:
+                df["date"] = df["date"].dt.strftime(date_format).astype(object)
+            location_data[location_name] = df
+
+        return location_data
+
+    # Gibt die Namen aller gespeicherten Standorte zurück
+    def locations(self) -> list[str]:
+        dataset = self._dataset()
+        if dataset is None:
+            return []
+        table = dataset.to_table(columns=["location"])
+        return sorted(set(table.column("location").to_pylist()))
+
+    def _location_path(self, location_name: str) -> str:
+        return os.path.join(self.root, f"location={quote(str(location_name), safe='')}")
+
+    def _partition_path(self, location_name: str, year: int) -> str:
+        directory = os.path.join(self._location_path(location_name), f"year={year}")
+        return os.path.join(directory, f"data.{self.formats[self.file_format]}")
+
+    def _write_file(self, path: str, df: pd.DataFrame):
+        import pyarrow as pa
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table     = pa.Table.from_pandas(df, preserve_index=False)
+        temporary = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(table, temporary)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, temporary, compression="uncompressed")
+
+        # Erst nach vollständigem Schreiben ersetzen, damit Leser nie eine halbe Datei sehen
+        os.replace(temporary, path)
+
+    def _read_file(self, path: str) -> pd.DataFrame:
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+            return pq.read_table(path, memory_map=True).to_pandas()
+
+        import pyarrow.feather as feather
+        return feather.read_table(path, memory_map=True).to_pandas()
+
+    # Filtert nach Datumsbereich (zuerst über die Jahres-Partition, dann über die Row Groups) und lädt die Zeilen
+    def _scan(self, dataset, expression, start, end, columns: list[str] = None) -> pd.DataFrame:
+        import pyarrow.dataset as ds
+
+        if start is not None:
+            start      = pd.Timestamp(start)
+            expression = self._and(expression, (ds.field("year") >= start.year) & (ds.field("date") >= start))
+        if end is not None:
+            end        = pd.Timestamp(end)
+            expression = self._and(expression, (ds.field("year") <= end.year) & (ds.field("date") <= end))
+
+        if columns is not None:
+            columns = list(dict.fromkeys(["date", *columns]))
+
+        df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+        return df.drop(columns=["year"], errors="ignore")
+
+    # Öffnet alle Partitionen bzw. nur die eines Standorts als pyarrow Dataset (None, wenn noch nichts gespeichert ist)
+    def _dataset(self, location_name: str = None):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as fs
+
+        if location_name is None:
+            path             = os.path.abspath(self.root)
+            partition_schema = pa.schema([("location", pa.string()), ("year", pa.int32())])
+        else:
+            path             = os.path.abspath(self._location_path(location_name))
+            partition_schema = pa.schema([("year", pa.int32())])
+            if not os.path.isdir(path):
+                return None
+
+        options = {
+            "format": "parquet" if self.file_format == "parquet" else "ipc",
+            "partitioning": ds.partitioning(partition_schema, flavor="hive"),
+            "filesystem": fs.LocalFileSystem(use_mmap=True)
+        }
+        dataset = ds.dataset(path, **options)
+        if not dataset.files:
+            return None
+
+        # API- und CSV-Standorte haben teils unterschiedliche Typen (z. B. leere Spalten, int vs. float):
+        # gemeinsames Schema aus den Datei-Metadaten bilden, ohne die Daten selbst zu lesen
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        schema  = pa.unify_schemas(schemas, promote_options="permissive")
+        for field in dataset.partitioning.schema:
+            schema = schema.append(field)
+        return ds.dataset(path, schema=schema, **options)
+
+    @staticmethod
+    def _and(expression, condition):
+        return condition if expression is None else expression & condition